@@ -52,6 +52,8 @@ class GeoPackage():
 		self.resolutions = tm.getResList()
 
 		if not self.isGPKG():
+			# File layout (page size, auto vacuum, WAL) must be set before the first table
+			SQLiteOptimizer.init_new_db(self.dbPath)
 			self.create()
 			self.insertMetadata()
 
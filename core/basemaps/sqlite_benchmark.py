@@ -4,12 +4,14 @@ Benchmark para validar otimizações SQLite no GeoPackage.
 
 Compara:
 - Time to insert 1000 tiles (before/after indexing)
-- Time to query tiles (best case, worst case)
+- Rowid table vs WITHOUT ROWID table clustered on (zoom_level, tile_column, tile_row)
+- Time to query tiles (best case, worst case, concurrent readers)
 - Database file size before/after VACUUM
 """
 
 import os
 import sqlite3
+import threading
 import time
 import tempfile
 import logging
@@ -17,78 +19,102 @@ from .sqlite_optimizer import SQLiteOptimizer
 
 log = logging.getLogger(__name__)
 
+# Current gpkg_tiles layout: rowid table + UNIQUE constraint on zxy
+# (no AUTOINCREMENT, id is never read and sqlite_sequence would cost a write per insert)
+TILES_SCHEMA = '''
+	CREATE TABLE IF NOT EXISTS gpkg_tiles (
+		id INTEGER PRIMARY KEY,
+		zoom_level INTEGER NOT NULL,
+		tile_column INTEGER NOT NULL,
+		tile_row INTEGER NOT NULL,
+		tile_data BLOB NOT NULL,
+		last_modified TIMESTAMP DEFAULT (datetime('now','localtime')),
+		UNIQUE (zoom_level, tile_column, tile_row)
+	)
+'''
+
+# Clustered variant: tiles stored directly in the zxy primary key B-tree
+TILES_SCHEMA_WITHOUT_ROWID = '''
+	CREATE TABLE IF NOT EXISTS gpkg_tiles (
+		zoom_level INTEGER NOT NULL,
+		tile_column INTEGER NOT NULL,
+		tile_row INTEGER NOT NULL,
+		tile_data BLOB NOT NULL,
+		last_modified TIMESTAMP DEFAULT (datetime('now','localtime')),
+		PRIMARY KEY (zoom_level, tile_column, tile_row)
+	) WITHOUT ROWID
+'''
+
+# schema name -> (CREATE TABLE statement, indexes created by the optimized run)
+SCHEMAS = {
+	'rowid': (TILES_SCHEMA, SQLiteOptimizer.INDEXES),
+	'without_rowid': (TILES_SCHEMA_WITHOUT_ROWID, SQLiteOptimizer.CLUSTERED_INDEXES),
+}
+
+INSERT_TILE_SQL = 'INSERT OR REPLACE INTO gpkg_tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)'
+
+
+def _tile_params(num_tiles: int, payload: bytes) -> list:
+	"""Build the (zoom, col, row, data) parameter tuples for the write benchmark.
+	
+	Built up front so that generating them is not part of the measured time.
+	"""
+	return [(10 + (i % 5), i % 256, i % 256, payload) for i in range(num_tiles)]
 
-def benchmark_tile_writes(db_path: str, num_tiles: int = 1000) -> dict:
+
+def benchmark_tile_writes(db_path: str, num_tiles: int = 1000, schema: str = 'rowid') -> dict:
 	"""Benchmark tile write performance.
 	
 	Args:
 		db_path: Path to test database
 		num_tiles: Number of tiles to insert
+		schema: gpkg_tiles layout to benchmark, key of SCHEMAS ('rowid' or 'without_rowid')
 	
 	Returns:
 		Dict with timing results (before, after optimization)
 	"""
 	results = {}
+	payload = b'x' * 5000  # 5KB dummy tile, shared by every row
+	params = _tile_params(num_tiles, payload)
+	create_sql, indexes = SCHEMAS[schema]
 
 	# Create test database WITHOUT optimization
 	db_unoptimized = sqlite3.connect(db_path)
-	db_unoptimized.execute('''
-		CREATE TABLE IF NOT EXISTS gpkg_tiles (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			zoom_level INTEGER NOT NULL,
-			tile_column INTEGER NOT NULL,
-			tile_row INTEGER NOT NULL,
-			tile_data BLOB NOT NULL,
-			last_modified TIMESTAMP DEFAULT (datetime('now','localtime')),
-			UNIQUE (zoom_level, tile_column, tile_row)
-		)
-	''')
+	db_unoptimized.execute(create_sql)
 	db_unoptimized.commit()
 
-	# Measure unoptimized write time
-	start = time.time()
-	for i in range(num_tiles):
-		db_unoptimized.execute(
-			'INSERT OR REPLACE INTO gpkg_tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)',
-			(10 + (i % 5), i % 256, i % 256, b'x' * 5000)  # 5KB dummy tiles
-		)
+	# Measure unoptimized write time (single transaction, as real tile seeding does)
+	start = time.perf_counter_ns()
+	db_unoptimized.execute('BEGIN')
+	db_unoptimized.executemany(INSERT_TILE_SQL, params)
 	db_unoptimized.commit()
-	unoptimized_time = time.time() - start
+	unoptimized_time = (time.perf_counter_ns() - start) / 1e9
 	results['write_unoptimized_sec'] = unoptimized_time
 	db_unoptimized.close()
 
-	# Create new database WITH optimization
+	# Create new database WITH optimization, file layout first (page size, WAL)
 	db_optimized_path = db_path.replace('.db', '_opt.db')
+	SQLiteOptimizer.init_new_db(db_optimized_path)
 	db_optimized = sqlite3.connect(db_optimized_path)
-	db_optimized.execute('''
-		CREATE TABLE IF NOT EXISTS gpkg_tiles (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			zoom_level INTEGER NOT NULL,
-			tile_column INTEGER NOT NULL,
-			tile_row INTEGER NOT NULL,
-			tile_data BLOB NOT NULL,
-			last_modified TIMESTAMP DEFAULT (datetime('now','localtime')),
-			UNIQUE (zoom_level, tile_column, tile_row)
-		)
-	''')
+	db_optimized.execute(create_sql)
 	db_optimized.commit()
 	db_optimized.close()
 
 	# Apply optimizations
-	SQLiteOptimizer.optimize_database(db_optimized_path)
-
-	# Measure optimized write time
-	db_optimized = sqlite3.connect(db_optimized_path)
-	start = time.time()
-	for i in range(num_tiles):
-		db_optimized.execute(
-			'INSERT OR REPLACE INTO gpkg_tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)',
-			(10 + (i % 5), i % 256, i % 256, b'x' * 5000)
-		)
+	SQLiteOptimizer.create_indexes(db_optimized_path, indexes)
+
+	# Measure optimized write time (per-connection PRAGMAs applied on this connection)
+	# autocheckpoint is off on this connection, the WAL is checkpointed in the background
+	checkpointer = SQLiteOptimizer.start_checkpoint_thread(db_optimized_path)
+	db_optimized = SQLiteOptimizer.connect(db_optimized_path, checkpointer=checkpointer)
+	start = time.perf_counter_ns()
+	db_optimized.execute('BEGIN')
+	db_optimized.executemany(INSERT_TILE_SQL, params)
 	db_optimized.commit()
-	optimized_time = time.time() - start
+	optimized_time = (time.perf_counter_ns() - start) / 1e9
 	results['write_optimized_sec'] = optimized_time
 	db_optimized.close()
+	checkpointer.stop()
 
 	# Calculate improvement
 	improvement = (unoptimized_time - optimized_time) / unoptimized_time * 100
@@ -100,49 +126,76 @@ def benchmark_tile_writes(db_path: str, num_tiles: int = 1000) -> dict:
 	return results
 
 
-def benchmark_tile_queries(db_path: str, num_queries: int = 100) -> dict:
+def benchmark_tile_queries(db_path: str, num_queries: int = 100, num_readers: int = 4) -> dict:
 	"""Benchmark tile query performance (after warm cache).
 	
 	Args:
 		db_path: Path to test database (must have tiles from benchmark_tile_writes)
 		num_queries: Number of queries to run
+		num_readers: Number of concurrent reader threads, each with its own connection
 	
 	Returns:
 		Dict with timing results
 	"""
 	results = {}
 
-	db = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+	db = SQLiteOptimizer.connect_readonly(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
 
 	# Warm up cache (single query)
 	db.execute('SELECT tile_data FROM gpkg_tiles LIMIT 1').fetchone()
 
+	params = [(10 + (i % 5), i % 256, i % 256) for i in range(num_queries)]
+
 	# Measure single-tile query time
-	start = time.time()
-	for i in range(num_queries):
-		db.execute(
-			'SELECT tile_data FROM gpkg_tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?',
-			(10 + (i % 5), i % 256, i % 256)
-		).fetchone()
-	query_time = time.time() - start
+	start = time.perf_counter_ns()
+	_run_point_queries(db, params)
+	query_time = (time.perf_counter_ns() - start) / 1e9
 	results['single_query_time_sec'] = query_time
 	results['avg_query_time_ms'] = (query_time / num_queries) * 1000
 
 	# Measure range query (multiple tiles at zoom level)
-	start = time.time()
+	start = time.perf_counter_ns()
 	for _ in range(10):
 		db.execute(
 			'SELECT tile_column, tile_row, tile_data FROM gpkg_tiles WHERE zoom_level=? AND tile_column BETWEEN ? AND ?',
 			(10, 0, 128)
 		).fetchall()
-	range_time = time.time() - start
+	range_time = (time.perf_counter_ns() - start) / 1e9
 	results['range_query_time_sec'] = range_time
 
 	db.close()
 
+	# Measure concurrent reads: the same lookups split across N readers
+	readers = [
+		SQLiteOptimizer.connect_readonly(db_path, check_same_thread=False)
+		for _ in range(num_readers)
+	]
+	threads = [
+		threading.Thread(target=_run_point_queries, args=(reader, params[i::num_readers]))
+		for i, reader in enumerate(readers)
+	]
+	start = time.perf_counter_ns()
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	results['concurrent_query_time_sec'] = (time.perf_counter_ns() - start) / 1e9
+	results['num_readers'] = num_readers
+	for reader in readers:
+		reader.close()
+
 	return results
 
 
+def _run_point_queries(db: sqlite3.Connection, params: list):
+	"""Run one single-tile lookup per (zoom, col, row) tuple on the given connection."""
+	for zxy in params:
+		db.execute(
+			'SELECT tile_data FROM gpkg_tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?',
+			zxy
+		).fetchone()
+
+
 def benchmark_database_size(db_path: str) -> dict:
 	"""Benchmark database file size before/after VACUUM.
 	
@@ -180,13 +233,23 @@ def run_full_benchmark(num_tiles: int = 1000, output: bool = True) -> dict:
 	"""
 	with tempfile.TemporaryDirectory() as tmpdir:
 		db_path = os.path.join(tmpdir, 'benchmark.db')
+		clustered_db_path = os.path.join(tmpdir, 'benchmark_clustered.db')
 
 		# Run benchmarks
 		write_results = benchmark_tile_writes(db_path, num_tiles)
 		query_results = benchmark_tile_queries(db_path, 100)
 		size_results = benchmark_database_size(db_path)
 
-		results = {**write_results, **query_results, **size_results}
+		# Same write/query phases on the WITHOUT ROWID layout, for head-to-head numbers
+		clustered_results = {
+			**benchmark_tile_writes(clustered_db_path, num_tiles, schema='without_rowid'),
+			**benchmark_tile_queries(clustered_db_path, 100),
+		}
+
+		results = {
+			**write_results, **query_results, **size_results,
+			**{f'clustered_{k}': v for k, v in clustered_results.items()}
+		}
 
 		if output:
 			log.info('=== SQLite GeoPackage Benchmark Results ===')
@@ -195,9 +258,16 @@ def run_full_benchmark(num_tiles: int = 1000, output: bool = True) -> dict:
 			log.info(f'Write improvement: {write_results["write_improvement_pct"]:.1f}%')
 			log.info(f'Single query avg: {query_results["avg_query_time_ms"]:.2f}ms')
 			log.info(f'Range query: {query_results["range_query_time_sec"]:.2f}s')
+			log.info(f'Concurrent queries ({query_results["num_readers"]} readers): {query_results["concurrent_query_time_sec"]:.2f}s')
 			log.info(f'Database size (before VACUUM): {size_results["size_before_mb"]:.1f}MB')
 			log.info(f'Database size (after VACUUM):  {size_results["size_after_mb"]:.1f}MB')
 			log.info(f'Space saved: {size_results["space_saved_pct"]:.1f}%')
+			log.info('--- WITHOUT ROWID schema ---')
+			log.info(f'Write {num_tiles} tiles (unoptimized): {clustered_results["write_unoptimized_sec"]:.2f}s')
+			log.info(f'Write {num_tiles} tiles (optimized):   {clustered_results["write_optimized_sec"]:.2f}s')
+			log.info(f'Single query avg: {clustered_results["avg_query_time_ms"]:.2f}ms')
+			log.info(f'Range query: {clustered_results["range_query_time_sec"]:.2f}s')
+			log.info(f'Concurrent queries ({clustered_results["num_readers"]} readers): {clustered_results["concurrent_query_time_sec"]:.2f}s')
 
 		return results
 
@@ -5,30 +5,90 @@ SQLite performance optimization utilities for GeoPackage tile cache.
 Applies:
 - Strategic indexes on frequently-queried columns (zoom_level, tile_column, tile_row)
 - PRAGMAs for write efficiency (WAL mode, cache size, synchronous mode)
+  split between persistent (file level) and per-connection settings
 - Connection pooling hints for multithreaded access
+- Background WAL checkpointing, so commits never pay for it
 """
 
 import logging
 import sqlite3
+import threading
+from pathlib import Path
 from typing import Optional
 
 log = logging.getLogger(__name__)
 
 
+class CheckpointThread(threading.Thread):
+	"""Daemon thread running PRAGMA wal_checkpoint(TRUNCATE) at a fixed interval."""
+
+	def __init__(self, db_path: str, interval: float = 30):
+		super().__init__(name='wal-checkpoint', daemon=True)
+		self.db_path = db_path
+		self.interval = interval
+		self._stop_event = threading.Event()
+
+	def run(self):
+		# The connection must be created in the thread that uses it
+		db = sqlite3.connect(self.db_path)
+		try:
+			while not self._stop_event.wait(self.interval):
+				self.checkpoint(db)
+			# Leave a truncated WAL behind
+			self.checkpoint(db)
+		finally:
+			db.close()
+
+	def checkpoint(self, db: sqlite3.Connection):
+		try:
+			busy, log_pages, checkpointed = db.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+			log.debug(f'WAL checkpoint {self.db_path}: {checkpointed}/{log_pages} pages (busy={busy})')
+		except sqlite3.Error as e:
+			log.warning(f'WAL checkpoint failed: {e}')
+
+	def stop(self, timeout: Optional[float] = None):
+		"""Run a last checkpoint and wait for the thread to exit."""
+		self._stop_event.set()
+		self.join(timeout)
+
+
 class SQLiteOptimizer:
 	"""Optimizes SQLite database for tile cache operations."""
 
-	# PRAGMAs for performance (tuned for moderate-sized caches, ~500MB)
-	PRAGMAS = {
-		'journal_mode': 'WAL',  # Write-Ahead Logging: better concurrency
+	# Per-connection PRAGMAs (tuned for moderate-sized caches, ~500MB)
+	# These are lost when the connection closes, so they must be applied to
+	# every connection that does real work (see connect()).
+	CONNECTION_PRAGMAS = {
 		'synchronous': 'NORMAL',  # Balance safety and speed (vs FULL/OFF)
 		'cache_size': -64000,  # 64MB cache (negative = KB)
 		'temp_store': 'MEMORY',  # Temp tables in RAM
 		'mmap_size': 30000000,  # Memory-map I/O (30MB)
-		'page_size': 4096,  # Standard SQLite page size
 		'busy_timeout': 5000,  # 5s timeout for locked DB
 	}
 
+	# PRAGMAs applied by apply_pragmas(), the same tuning. The journal mode is
+	# set (and checked) separately, see set_journal_mode(), and the page size
+	# belongs to the file layout, see PERSISTENT_PRAGMAS and init_new_db()
+	PRAGMAS = dict(CONNECTION_PRAGMAS)
+
+	# Per-connection PRAGMAs for read-only connections (see connect_readonly())
+	READER_PRAGMAS = {
+		'query_only': 1,  # Reject any write issued through this connection
+		'cache_size': -64000,  # 64MB cache (negative = KB)
+		'mmap_size': 268435456,  # Memory-map I/O (256MB), reads skip the page cache copy
+	}
+
+	# Persistent PRAGMAs, stored in the database file itself
+	# page_size and auto_vacuum only take effect before the first table is created
+	PERSISTENT_PRAGMAS = {
+		'page_size': 8192,  # A ~5KB tile blob fits in a single page
+		'auto_vacuum': 'INCREMENTAL',  # Allow reclaiming free pages without a full VACUUM
+	}
+
+	# Write-Ahead Logging: better concurrency. Persistent too, but set through
+	# set_journal_mode() because SQLite reports the mode actually applied
+	JOURNAL_MODE = 'WAL'
+
 	# Indexes for tile queries (zoom_level, tile_column, tile_row)
 	INDEXES = {
 		'idx_tiles_zoom': (
@@ -48,10 +108,196 @@ class SQLiteOptimizer:
 		),
 	}
 
+	# Indexes for a WITHOUT ROWID gpkg_tiles keyed on (zoom_level, tile_column, tile_row):
+	# the primary key is already the clustered zxy index, idx_tiles_zxy would be redundant
+	CLUSTERED_INDEXES = {name: index for name, index in INDEXES.items() if name != 'idx_tiles_zxy'}
+
+	@staticmethod
+	def apply_pragmas_to_conn(db: sqlite3.Connection, pragmas: Optional[dict] = None) -> bool:
+		"""Apply per-connection PRAGMAs to an open connection.
+		
+		Args:
+			db: Open SQLite connection
+			pragmas: Dict of PRAGMA name -> value (uses CONNECTION_PRAGMAS if None)
+		
+		Returns:
+			True if successful, False otherwise
+		"""
+		if pragmas is None:
+			pragmas = SQLiteOptimizer.CONNECTION_PRAGMAS
+
+		try:
+			for pragma_name, pragma_value in pragmas.items():
+				db.execute(f'PRAGMA {pragma_name} = {pragma_value}')
+			log.debug(f'Applied {len(pragmas)} PRAGMAs to connection')
+			return True
+		except Exception as e:
+			log.warning(f'Failed to apply PRAGMAs: {e}')
+			return False
+
+	@staticmethod
+	def connect(db_path: str, pragmas: Optional[dict] = None,
+			checkpointer: Optional[CheckpointThread] = None, **kwargs) -> sqlite3.Connection:
+		"""Open a connection with the per-connection PRAGMAs already applied.
+		
+		Automatic WAL checkpointing is only turned off when a running
+		checkpointer is given, otherwise the WAL would grow without bound.
+		
+		Args:
+			db_path: Path to SQLite database
+			pragmas: Dict of PRAGMA name -> value (uses CONNECTION_PRAGMAS if None)
+			checkpointer: Running CheckpointThread for db_path (see start_checkpoint_thread())
+			**kwargs: Extra arguments forwarded to sqlite3.connect
+		
+		Returns:
+			Configured sqlite3.Connection
+		"""
+		if pragmas is None:
+			pragmas = SQLiteOptimizer.CONNECTION_PRAGMAS
+		if checkpointer is not None and checkpointer.is_alive():
+			pragmas = dict(pragmas, wal_autocheckpoint=0)
+
+		db = sqlite3.connect(db_path, **kwargs)
+		SQLiteOptimizer.apply_pragmas_to_conn(db, pragmas)
+		return db
+
+	@staticmethod
+	def connect_readonly(db_path: str, pragmas: Optional[dict] = None, **kwargs) -> sqlite3.Connection:
+		"""Open a read-only, shared-cache connection for tile lookups.
+		
+		Several reader connections opened this way share one page cache and,
+		with WAL enabled, never block the writer.
+		
+		Args:
+			db_path: Path to an existing SQLite database
+			pragmas: Dict of PRAGMA name -> value (uses READER_PRAGMAS if None)
+			**kwargs: Extra arguments forwarded to sqlite3.connect
+		
+		Returns:
+			Configured sqlite3.Connection
+		"""
+		if pragmas is None:
+			pragmas = SQLiteOptimizer.READER_PRAGMAS
+
+		uri = Path(db_path).resolve().as_uri() + '?mode=ro&cache=shared'
+		db = sqlite3.connect(uri, uri=True, **kwargs)
+		SQLiteOptimizer.apply_pragmas_to_conn(db, pragmas)
+		return db
+
+	@staticmethod
+	def set_journal_mode(db: sqlite3.Connection, mode: Optional[str] = None) -> bool:
+		"""Switch journal mode and check SQLite actually accepted it.
+		
+		Args:
+			db: Open SQLite connection
+			mode: Journal mode to set (uses JOURNAL_MODE if None)
+		
+		Returns:
+			True if the database now uses the requested mode, False otherwise
+		"""
+		if mode is None:
+			mode = SQLiteOptimizer.JOURNAL_MODE
+
+		row = db.execute(f'PRAGMA journal_mode = {mode}').fetchone()
+		if row is None or row[0].lower() != mode.lower():
+			log.warning(f'Journal mode {mode} not accepted, database is using {row[0] if row else "unknown"}')
+			return False
+		return True
+
+	@staticmethod
+	def start_checkpoint_thread(db_path: str, interval: float = 30) -> CheckpointThread:
+		"""Start checkpointing the WAL of db_path from a background thread.
+		
+		Pass the returned thread to connect(checkpointer=...) to disable
+		wal_autocheckpoint on that connection, which otherwise makes one commit
+		every ~1000 pages stall while the whole WAL is copied back and synced.
+		The WAL then grows until the next checkpoint, so keep this running
+		while writing through that connection.
+		
+		Args:
+			db_path: Path to SQLite database (in WAL mode)
+			interval: Seconds between checkpoints
+		
+		Returns:
+			Running CheckpointThread, call stop() when done writing
+		"""
+		thread = CheckpointThread(db_path, interval)
+		thread.start()
+		return thread
+
+	@staticmethod
+	def init_new_db(db_path: str, page_size: Optional[int] = None) -> bool:
+		"""Set up the file layout of a new database, before any table is created.
+		
+		page_size and auto_vacuum are ignored once the database has content,
+		and page_size can not change while in WAL mode, so they are applied and
+		written to disk (VACUUM) before WAL is enabled.
+		
+		Args:
+			db_path: Path to SQLite database (new or still empty)
+			page_size: Page size in bytes (uses PERSISTENT_PRAGMAS if None)
+		
+		Returns:
+			True if successful, False otherwise
+		"""
+		pragmas = dict(SQLiteOptimizer.PERSISTENT_PRAGMAS)
+		if page_size is not None:
+			pragmas['page_size'] = page_size
+
+		try:
+			db = sqlite3.connect(db_path)
+			for pragma_name, pragma_value in pragmas.items():
+				db.execute(f'PRAGMA {pragma_name} = {pragma_value}')
+			db.execute('VACUUM')
+			success = SQLiteOptimizer.set_journal_mode(db)
+			actual = db.execute('PRAGMA page_size').fetchone()[0]
+			db.close()
+			if actual != pragmas['page_size']:
+				log.warning(f'Page size {pragmas["page_size"]} not applied to {db_path} (has content?), using {actual}')
+				return False
+			log.debug(f'Initialized {db_path} with page_size={actual}')
+			return success
+		except Exception as e:
+			log.warning(f'Failed to initialize database: {e}')
+			return False
+
+	@staticmethod
+	def apply_persistent_pragmas(db_path: str, pragmas: Optional[dict] = None) -> bool:
+		"""Apply PRAGMAs that are stored in the database file, then enable WAL.
+		
+		Should be called once, when the database is created.
+		
+		Args:
+			db_path: Path to SQLite database
+			pragmas: Dict of PRAGMA name -> value (uses PERSISTENT_PRAGMAS if None)
+		
+		Returns:
+			True if successful, False otherwise
+		"""
+		if pragmas is None:
+			pragmas = SQLiteOptimizer.PERSISTENT_PRAGMAS
+
+		try:
+			db = sqlite3.connect(db_path)
+			for pragma_name, pragma_value in pragmas.items():
+				db.execute(f'PRAGMA {pragma_name} = {pragma_value}')
+			success = SQLiteOptimizer.set_journal_mode(db)
+			db.close()
+			log.debug(f'Applied {len(pragmas)} persistent PRAGMAs to {db_path}')
+			return success
+		except Exception as e:
+			log.warning(f'Failed to apply persistent PRAGMAs: {e}')
+			return False
+
 	@staticmethod
 	def apply_pragmas(db_path: str, pragmas: Optional[dict] = None) -> bool:
 		"""Apply performance PRAGMAs to database.
 		
+		Also switches the database to JOURNAL_MODE and checks it was accepted.
+		Only the persistent PRAGMAs (page_size on a new database) and the
+		journal mode outlive the connection used here, use connect() or
+		apply_pragmas_to_conn() for the per-connection ones.
+		
 		Args:
 			db_path: Path to SQLite database
 			pragmas: Dict of PRAGMA name -> value (uses PRAGMAS if None)
@@ -66,9 +312,10 @@ class SQLiteOptimizer:
 			db = sqlite3.connect(db_path)
 			for pragma_name, pragma_value in pragmas.items():
 				db.execute(f'PRAGMA {pragma_name} = {pragma_value}')
+			success = SQLiteOptimizer.set_journal_mode(db)
 			db.close()
 			log.debug(f'Applied {len(pragmas)} PRAGMAs to {db_path}')
-			return True
+			return success
 		except Exception as e:
 			log.warning(f'Failed to apply PRAGMAs: {e}')
 			return False
@@ -7,13 +7,28 @@ mais simples a testabilidade e reutilização.
 """
 from typing import Tuple
 
+import numpy as np
+
+# numexpr avalia a expressão inteira em um único laço SIMD, sem temporários
+try:
+	import numexpr as ne
+	HAS_NUMEXPR = True
+except ImportError:
+	HAS_NUMEXPR = False
+
+try:
+	import numba
+	HAS_NUMBA = True
+except ImportError:
+	HAS_NUMBA = False
+
 
 def view3d_to_proj(crsx: float, crsy: float, scale: float, dx: float, dy: float) -> Tuple[float, float]:
 	"""Converte coordenadas da View3D (dx, dy) para coordenadas no CRS.
 	Parâmetros:
 	- crsx, crsy: origem da cena no espaço CRS
 	- scale: escala (metros por unidade de View3D)
-	- dx, dy: deslocamento relativo na View3D
+	- dx, dy: deslocamento relativo na View3D (escalares ou arrays NumPy)
 	Retorna:
 	- x, y: coordenadas no espaço CRS
 	"""
@@ -24,15 +39,57 @@ def view3d_to_proj(crsx: float, crsy: float, scale: float, dx: float, dy: float)
 
 def proj_to_view3d(crsx: float, crsy: float, scale: float, x: float, y: float) -> Tuple[float, float]:
 	"""Converte coordenadas no CRS (x, y) para deslocamento relativo na View3D.
+	É a inversa de `view3d_to_proj`.
 	Parâmetros:
 	- crsx, crsy: origem da cena no espaço CRS
 	- scale: escala (metros por unidade de View3D)
-	- x, y: coordenadas no espaço CRS
+	- x, y: coordenadas no espaço CRS (escalares ou arrays NumPy)
 	Retorna:
 	- dx, dy: deslocamento relativo na View3D
 	"""
-	dx = (x * scale) - crsx
-	dy = (y * scale) - crsy
+	dx = (x - crsx) / scale
+	dy = (y - crsy) / scale
+	return dx, dy
+
+
+def view3d_to_proj_array(crsx: float, crsy: float, scale: float, dx, dy) -> Tuple[np.ndarray, np.ndarray]:
+	"""Versão vetorizada de `view3d_to_proj` para muitas coordenadas de uma vez.
+	Cada saída é calculada em um único buffer (multiplicação e soma in-place),
+	sem arrays temporários intermediários.
+	Parâmetros:
+	- crsx, crsy: origem da cena no espaço CRS
+	- scale: escala (metros por unidade de View3D)
+	- dx, dy: sequências ou arrays de deslocamentos na View3D
+	Retorna:
+	- x, y: arrays float64 de coordenadas no espaço CRS
+	"""
+	x = np.multiply(np.asarray(dx, dtype=np.float64), scale)
+	np.add(x, crsx, out=x)
+	y = np.multiply(np.asarray(dy, dtype=np.float64), scale)
+	np.add(y, crsy, out=y)
+	return x, y
+
+
+def proj_to_view3d_array(crsx: float, crsy: float, scale: float, x, y) -> Tuple[np.ndarray, np.ndarray]:
+	"""Versão vetorizada de `proj_to_view3d` para muitas coordenadas de uma vez.
+	Usa numexpr quando disponível, senão subtração e divisão in-place do NumPy.
+	Parâmetros:
+	- crsx, crsy: origem da cena no espaço CRS
+	- scale: escala (metros por unidade de View3D)
+	- x, y: sequências ou arrays de coordenadas no espaço CRS
+	Retorna:
+	- dx, dy: arrays float64 de deslocamentos na View3D
+	"""
+	x = np.asarray(x, dtype=np.float64)
+	y = np.asarray(y, dtype=np.float64)
+	if HAS_NUMEXPR:
+		dx = ne.evaluate('(x - crsx) / scale')
+		dy = ne.evaluate('(y - crsy) / scale')
+		return dx, dy
+	dx = np.subtract(x, crsx)
+	np.divide(dx, scale, out=dx)
+	dy = np.subtract(y, crsy)
+	np.divide(dy, scale, out=dy)
 	return dx, dy
 
 
@@ -48,3 +105,33 @@ def move_origin_prj(crsx: float, crsy: float, dx: float, dy: float, scale: float
 		new_x = crsx + dx
 		new_y = crsy + dy
 	return new_x, new_y
+
+
+if HAS_NUMBA:
+	@numba.njit(parallel=True, fastmath=True, cache=True)
+	def _move_origin_kernel(crsx, crsy, dx, dy, s):
+		n = crsx.shape[0]
+		out_x = np.empty(n)
+		out_y = np.empty(n)
+		for i in numba.prange(n):
+			out_x[i] = crsx[i] + dx[i] * s
+			out_y[i] = crsy[i] + dy[i] * s
+		return out_x, out_y
+else:
+	def _move_origin_kernel(crsx, crsy, dx, dy, s):
+		return crsx + dx * s, crsy + dy * s
+
+
+def move_origin_prj_batch(crsx, crsy, dx, dy, scale: float, use_scale: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+	"""Versão em lote de `move_origin_prj` para várias origens de uma vez.
+	Compilada com Numba (laço paralelo) quando disponível, senão NumPy vetorizado.
+	Parâmetros:
+	- crsx, crsy: arrays de origens no espaço CRS
+	- dx, dy: arrays de deltas relativos
+	- scale: escala aplicada aos deltas se `use_scale` for True
+	Retorna:
+	- new_x, new_y: arrays float64 com as novas origens no CRS
+	"""
+	s = float(scale) if use_scale else 1.0
+	arrays = [np.ascontiguousarray(a, dtype=np.float64) for a in (crsx, crsy, dx, dy)]
+	return _move_origin_kernel(*arrays, s)
@@ -0,0 +1,150 @@
+# -*- coding:utf-8 -*-
+"""
+Keep-alive HTTP connections
+Reuses one connection per host and per thread, so repeated requests to the
+same server (map tiles, DEM queries) pay the TCP/TLS handshake only once
+"""
+
+import logging
+import socket
+import threading
+from http.client import HTTPConnection, HTTPSConnection, HTTPException, IncompleteRead
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, urlopen, getproxies
+from urllib.error import URLError, HTTPError
+
+log = logging.getLogger(__name__)
+
+
+MAX_REDIRECTS = 5
+
+# Keep-alive connections, one dict (scheme, netloc) -> connection per thread
+# since http.client connections are not thread safe
+_pool = threading.local()
+
+
+def get_connection(scheme: str, netloc: str, timeout: float):
+	"""Return a persistent connection to netloc for the calling thread."""
+	conns = _pool.__dict__.setdefault('conns', {})
+	key = (scheme, netloc)
+	conn = conns.get(key)
+	if conn is None:
+		cls = HTTPSConnection if scheme == 'https' else HTTPConnection
+		conn = cls(netloc, timeout=timeout)
+		conns[key] = conn
+	else:
+		conn.timeout = timeout
+	return conn
+
+
+def drop_connection(scheme: str, netloc: str):
+	"""Close and forget the calling thread's connection to netloc."""
+	conns = _pool.__dict__.get('conns', {})
+	conn = conns.pop((scheme, netloc), None)
+	if conn is not None:
+		conn.close()
+
+
+def close_connections():
+	"""Close the keep-alive connections opened by the calling thread."""
+	for scheme, netloc in list(_pool.__dict__.get('conns', {})):
+		drop_connection(scheme, netloc)
+
+
+def open_url(url: str, headers: Optional[dict] = None, timeout: float = 30):
+	"""
+	GET url over a pooled keep-alive connection, following redirects.
+
+	Behaves like urlopen: the response is returned with its body unread and
+	errors are raised as URLError / HTTPError / TimeoutError. The body must be
+	read (or the response closed) before the next request from the same
+	thread to the same host. When a proxy is configured in the environment,
+	urlopen is used instead. A 304 Not Modified is returned as a response in
+	both cases.
+
+	Args:
+		url: URL to fetch
+		headers: Extra request headers
+		timeout: Socket timeout in seconds
+
+	Returns:
+		http.client.HTTPResponse
+	"""
+	headers = dict(headers or {})
+
+	if urlsplit(url).scheme in getproxies():
+		try:
+			return urlopen(Request(url, headers=headers), timeout=timeout)
+		except HTTPError as e:
+			if e.code != 304:
+				raise
+			# urllib reports 304 as an error, return it like the pooled path does
+			# (HTTPError has no status attribute before Python 3.9)
+			if not hasattr(e, 'status'):
+				e.status = e.code
+			return e
+
+	headers.setdefault('Connection', 'keep-alive')
+	for _ in range(MAX_REDIRECTS + 1):
+		parts = urlsplit(url)
+		if parts.scheme not in ('http', 'https'):
+			raise URLError(f"unsupported scheme {parts.scheme!r}")
+		path = parts.path or '/'
+		if parts.query:
+			path += '?' + parts.query
+
+		# A reused connection may have been closed by the server while idle,
+		# in that case retry once right away on a fresh one
+		for attempt in range(2):
+			conn = get_connection(parts.scheme, parts.netloc, timeout)
+			reused = conn.sock is not None
+			try:
+				conn.request('GET', path, headers=headers)
+				response = conn.getresponse()
+				break
+			except socket.timeout as e:
+				drop_connection(parts.scheme, parts.netloc)
+				raise TimeoutError(f"timed out fetching {url}") from e
+			except (HTTPException, OSError) as e:
+				drop_connection(parts.scheme, parts.netloc)
+				if reused and attempt == 0:
+					continue
+				raise URLError(e) from e
+
+		if response.status in (301, 302, 303, 307, 308) and response.getheader('Location'):
+			# Drain the body so the connection can be reused
+			response.read()
+			url = urljoin(url, response.getheader('Location'))
+			continue
+		if response.status >= 400:
+			response.read()
+			raise HTTPError(url, response.status, response.reason, response.msg, None)
+		return response
+
+	raise HTTPError(url, response.status, 'Too many redirects', response.msg, None)
+
+
+def read_body(response) -> bytes:
+	"""
+	Read a whole response body, into a preallocated buffer when its size is known.
+
+	Network errors are raised as URLError / TimeoutError, like open_url does.
+	"""
+	try:
+		if not response.length:
+			# Chunked transfer, unknown size or empty body
+			return response.read()
+		buf = bytearray(response.length)
+		view = memoryview(buf)
+		pos = 0
+		while pos < len(buf):
+			n = response.readinto(view[pos:])
+			if not n:
+				raise IncompleteRead(bytes(buf[:pos]), len(buf) - pos)
+			pos += n
+		return bytes(buf)
+	except socket.timeout as e:
+		raise TimeoutError("timed out reading response") from e
+	except (HTTPException, OSError) as e:
+		raise URLError(e) from e
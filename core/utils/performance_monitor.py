@@ -14,19 +14,90 @@ Provides visualization dashboard and regression alerts.
 
 import time
 import logging
-from typing import Dict, List, Optional
+import queue
+import threading
+import weakref
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional
 from datetime import datetime, timedelta
 from collections import deque, defaultdict
-from dataclasses import dataclass, asdict
+from itertools import islice
 import json
 from pathlib import Path
 
+import numpy as np
+
 log = logging.getLogger(__name__)
 
+# orjson is much faster than the stdlib json for numeric records, use it when available
+try:
+	import orjson
+	HAS_ORJSON = True
+except ImportError:
+	HAS_ORJSON = False
+
+
+def _dumps_line(obj) -> bytes:
+	"""Serialize obj as one NDJSON line."""
+	if HAS_ORJSON:
+		return orjson.dumps(obj, default=str) + b'\n'
+	return json.dumps(obj, default=str).encode('utf-8') + b'\n'
+
+
+def _loads(data):
+	"""Parse a JSON document (str or bytes)."""
+	if HAS_ORJSON:
+		return orjson.loads(data)
+	return json.loads(data)
+
+
+# Seconds between two summaries of threshold regressions
+REGRESSION_LOG_INTERVAL = 10.0
+
+# Operation key of thresholds that apply to a metric whatever its operation
+ANY_OPERATION = '*'
+
 
-@dataclass
-class MetricEvent:
-	"""Single metric measurement."""
+def _threshold_loop(monitor_ref, events: queue.SimpleQueue, stop: threading.Event):
+	"""Consume recorded events, count regressions and log a periodic summary.
+	
+	Only holds a weak reference to the monitor while waiting for events, so
+	an unused monitor can still be collected (which stops this loop).
+	"""
+	next_flush = time.monotonic() + REGRESSION_LOG_INTERVAL
+	while not stop.is_set():
+		try:
+			event = events.get(timeout=max(0.0, next_flush - time.monotonic()))
+		except queue.Empty:
+			event = None
+		monitor = monitor_ref()
+		if monitor is None:
+			return
+		if event is not None:
+			try:
+				monitor._check_thresholds(event)
+			except Exception as e:
+				log.debug(f"Threshold check failed: {e}")
+		if stop.is_set() or time.monotonic() >= next_flush:
+			monitor._flush_regressions()
+			next_flush = time.monotonic() + REGRESSION_LOG_INTERVAL
+		del monitor
+
+
+def _stop_threshold_loop(events: queue.SimpleQueue, stop: threading.Event):
+	"""Ask the threshold loop to exit, waking it up if it is waiting."""
+	stop.set()
+	# None is never a recorded event, it only wakes the loop up
+	events.put(None)
+
+
+class MetricEvent(NamedTuple):
+	"""Single metric measurement.
+	
+	A NamedTuple rather than a dataclass: no per-instance __dict__, which
+	matters with thousands of buffered events.
+	"""
 	timestamp: float
 	operation: str
 	metric_name: str
@@ -56,17 +127,87 @@ class PerformanceMonitor:
 		self.max_events = max_events
 		self.events = deque(maxlen=max_events)
 		self.thresholds = self._init_thresholds()
+		self._index_thresholds()
+
+		# Columnar indexes over self.events, both in timestamp order so a time
+		# window is located with a binary search instead of a full scan:
+		# - timestamps of all events (parallel to self.events)
+		# - (operation, metric_name) -> (timestamps, values) for each series
+		self._timestamps = array('d')
+		self._series = {}
+
+		# Evicted events are only removed from the indexes in batches, one
+		# slice deletion per array (see _trim_indexes()):
+		# (operation, metric_name) -> evicted events still in that series
+		self._evicted = defaultdict(int)
+		self._trim_batch = max(1, max_events // 8)
+
+		# Guards events and indexes: record_metric is called from download threads
+		self._lock = threading.Lock()
+
+		# Threshold checks (formatting, logging) run on a background thread
+		self._threshold_queue = queue.SimpleQueue()
+		self._threshold_stop = threading.Event()
+		self._threshold_worker = None
+		self._finalizer = weakref.finalize(
+			self, _stop_threshold_loop, self._threshold_queue, self._threshold_stop
+		)
+
+		# (operation, metric_name, 'min'|'max') -> [count, worst value] since the
+		# last summary, only touched by the threshold thread
+		self._regression_counter = {}
 
 	def _init_thresholds(self) -> Dict:
-		"""Initialize performance thresholds for alerts."""
+		"""Initialize performance thresholds for alerts.
+		
+		Returns:
+			Dict mapping operation -> metric_name -> threshold
+		"""
 		return {
-			'download_speed': {'min': 100000, 'unit': 'bytes/sec'},  # Min 100KB/s
-			'cache_hit_rate': {'min': 0.7, 'unit': '%'},  # Min 70% hit rate
-			'tile_download_latency': {'max': 5.0, 'unit': 'sec'},  # Max 5s per tile
-			'raster_import_latency': {'max': 30.0, 'unit': 'sec'},  # Max 30s
-			'error_rate': {'max': 0.05, 'unit': 'ratio'},  # Max 5% errors
+			ANY_OPERATION: {
+				'download_speed': {'min': 100000, 'unit': 'bytes/sec'},  # Min 100KB/s
+				'cache_hit_rate': {'min': 0.7, 'unit': '%'},  # Min 70% hit rate
+				'error_rate': {'max': 0.05, 'unit': 'ratio'},  # Max 5% errors
+			},
+			'tile_download': {
+				'latency': {'max': 5.0, 'unit': 'sec'},  # Max 5s per tile
+			},
+			'raster_import': {
+				'latency': {'max': 30.0, 'unit': 'sec'},  # Max 30s
+			},
 		}
 
+	def _index_thresholds(self):
+		"""Precompute which (operation, metric) pairs have a threshold.
+		
+		Lets record_metric skip the threshold check entirely for the vast
+		majority of events, which have none.
+		"""
+		self._threshold_keys = frozenset(
+			(op_name, metric_name)
+			for op_name, metrics in self.thresholds.items() if op_name != ANY_OPERATION
+			for metric_name in metrics
+		)
+		self._any_op_threshold_metrics = frozenset(self.thresholds.get(ANY_OPERATION, {}))
+
+	def set_threshold(self, operation: str, metric_name: str, threshold: Dict):
+		"""Add or replace a threshold.
+		
+		Args:
+			operation: Operation name, or ANY_OPERATION
+			metric_name: Metric name
+			threshold: Dict with 'min' and/or 'max' (and optional 'unit')
+		"""
+		self.thresholds.setdefault(operation, {})[metric_name] = threshold
+		self._index_thresholds()
+
+	def _get_threshold(self, operation: str, metric_name: str) -> Optional[Dict]:
+		"""Threshold for an (operation, metric) pair, None if there is none."""
+		threshold = self.thresholds.get(operation, {}).get(metric_name)
+		if threshold is None:
+			threshold = self.thresholds.get(ANY_OPERATION, {}).get(metric_name)
+		return threshold
+
 	def record_metric(
 		self,
 		operation: str,
@@ -82,40 +223,169 @@ class PerformanceMonitor:
 			value: Metric value
 			metadata: Optional metadata (file size, count, etc.)
 		"""
-		event = MetricEvent(
-			timestamp=time.time(),
-			operation=operation,
-			metric_name=metric_name,
-			value=value,
-			metadata=metadata
-		)
+		# Timestamp taken under the lock, so events are appended in time order
+		with self._lock:
+			event = MetricEvent(
+				timestamp=time.time(),
+				operation=operation,
+				metric_name=metric_name,
+				value=value,
+				metadata=metadata
+			)
+			self._append(event)
+		
+		# Check thresholds off the hot path, only for metrics that have one
+		# Nothing drains the queue once the monitor is closed
+		if self._threshold_stop.is_set():
+			return
+		if (operation, metric_name) in self._threshold_keys or metric_name in self._any_op_threshold_metrics:
+			self._ensure_threshold_worker()
+			self._threshold_queue.put(event)
+
+	def _ensure_threshold_worker(self):
+		"""Start the background threshold checker on first use."""
+		if self._threshold_worker is not None:
+			return
+		with self._lock:
+			if self._threshold_worker is None and not self._threshold_stop.is_set():
+				self._threshold_worker = threading.Thread(
+					target=_threshold_loop,
+					args=(weakref.ref(self), self._threshold_queue, self._threshold_stop),
+					name='PerformanceMonitorThresholds',
+					daemon=True
+				)
+				self._threshold_worker.start()
+
+	def close(self, timeout: Optional[float] = None):
+		"""Stop the background threshold checker, after a last regression summary.
+		
+		Args:
+			timeout: Max seconds to wait for the thread to exit (None = no limit)
+		"""
+		self._finalizer()
+		worker = self._threshold_worker
+		if worker is not None and worker is not threading.current_thread():
+			worker.join(timeout)
+
+	def _flush_regressions(self):
+		"""Log one summary of the regressions counted since the last flush."""
+		if not self._regression_counter:
+			return
+		counter, self._regression_counter = self._regression_counter, {}
+		lines = []
+		for (operation, metric_name, bound), (count, worst) in counter.items():
+			threshold = self._get_threshold(operation, metric_name)
+			expected = '>=' if bound == 'min' else '<='
+			lines.append(
+				f"{operation}.{metric_name}: {count} events, worst {worst} "
+				f"(expected {expected} {threshold[bound]})"
+			)
+		summary = '\n  '.join(lines)
+		log.warning(f"Performance regressions in the last {REGRESSION_LOG_INTERVAL:g}s:\n  {summary}")
+
+	def _append(self, event: MetricEvent):
+		"""Store event and keep the columnar indexes in sync with self.events.
+		
+		Caller must hold self._lock.
+		"""
+		if len(self.events) == self.max_events:
+			# Oldest event is about to be evicted, it is also the oldest of its series
+			oldest = self.events[0]
+			self._evicted[(oldest.operation, oldest.metric_name)] += 1
+
 		self.events.append(event)
+		self._timestamps.append(event.timestamp)
+		key = (event.operation, event.metric_name)
+		if key not in self._series:
+			self._series[key] = (array('d'), array('d'))
+		series_ts, series_values = self._series[key]
+		series_ts.append(event.timestamp)
+		series_values.append(event.value)
+
+		if len(self._timestamps) - len(self.events) >= self._trim_batch:
+			self._trim_indexes()
+
+	def _trim_indexes(self):
+		"""Drop the evicted events from the columnar indexes.
 		
-		# Check thresholds
-		self._check_thresholds(event)
+		Evicted events are always the oldest ones, so each array loses a
+		single leading slice. Cut by count rather than by timestamp, several
+		events can share one timestamp.
+		
+		Caller must hold self._lock.
+		"""
+		excess = len(self._timestamps) - len(self.events)
+		if excess:
+			del self._timestamps[:excess]
+		for key, count in self._evicted.items():
+			series_ts, series_values = self._series[key]
+			del series_ts[:count]
+			del series_values[:count]
+		self._evicted.clear()
+
+	def _rebuild_indexes(self):
+		"""Rebuild columnar indexes, sorting events by timestamp first.
+		
+		Caller must hold self._lock.
+		"""
+		events = sorted(self.events, key=lambda e: e.timestamp)
+		self.events.clear()
+		self._timestamps = array('d')
+		self._series = {}
+		self._evicted.clear()
+		for event in events:
+			self._append(event)
+
+	@staticmethod
+	def _series_window(series: tuple, cutoff_time: float) -> np.ndarray:
+		"""Values of one series recorded at or after cutoff_time, as a float64 array.
+		
+		The slice is a copy: a numpy view on the live array.array would block
+		further appends while it is alive.
+		"""
+		series_ts, series_values = series
+		start = bisect_left(series_ts, cutoff_time)
+		return np.frombuffer(series_values[start:], dtype=np.float64)
+
+	def _window_values(self, operation: Optional[str], metric_name: Optional[str], cutoff_time: float) -> List[np.ndarray]:
+		"""Values of every matching series recorded at or after cutoff_time."""
+		windows = []
+		for (op_name, name), series in self._series.items():
+			if operation is not None and op_name != operation:
+				continue
+			if metric_name is not None and name != metric_name:
+				continue
+			values = self._series_window(series, cutoff_time)
+			if len(values):
+				windows.append(values)
+		return windows
 
 	def _check_thresholds(self, event: MetricEvent):
-		"""Check if metric exceeds thresholds and alert if needed."""
-		threshold_key = f"{event.operation}_{event.metric_name}"
+		"""Count the event as a regression if it is outside its thresholds.
 		
-		if threshold_key not in self.thresholds:
+		Regressions are reported by _flush_regressions(), one summary per
+		interval rather than one log record per event.
+		"""
+		threshold = self._get_threshold(event.operation, event.metric_name)
+		if threshold is None:
 			return
 
-		threshold = self.thresholds[threshold_key]
-
 		# Check minimum threshold
 		if 'min' in threshold and event.value < threshold['min']:
-			log.warning(
-				f"Performance regression: {event.operation}.{event.metric_name} = {event.value} "
-				f"(expected >= {threshold['min']})"
-			)
+			self._count_regression(event, 'min', min)
 
 		# Check maximum threshold
 		if 'max' in threshold and event.value > threshold['max']:
-			log.warning(
-				f"Performance regression: {event.operation}.{event.metric_name} = {event.value} "
-				f"(expected <= {threshold['max']})"
-			)
+			self._count_regression(event, 'max', max)
+
+	def _count_regression(self, event: MetricEvent, bound: str, worst_of):
+		key = (event.operation, event.metric_name, bound)
+		entry = self._regression_counter.get(key)
+		if entry is None:
+			self._regression_counter[key] = [1, event.value]
+		else:
+			entry[0] += 1
+			entry[1] = worst_of(entry[1], event.value)
 
 	def get_metric_summary(
 		self,
@@ -135,28 +405,31 @@ class PerformanceMonitor:
 		"""
 		cutoff_time = time.time() - (minutes * 60) if minutes > 0 else 0
 
-		# Filter events
-		filtered = [
-			e for e in self.events
-			if e.timestamp >= cutoff_time
-			and (operation is None or e.operation == operation)
-			and (metric_name is None or e.metric_name == metric_name)
-		]
-
-		if not filtered:
+		with self._lock:
+			self._trim_indexes()
+			windows = self._window_values(operation, metric_name, cutoff_time)
+		if not windows:
 			return {}
 
-		values = [e.value for e in filtered]
+		values = np.concatenate(windows)
+		count = len(values)
+
+		# Median, p95 and p99 from a single O(N) partition instead of sorting.
+		# Indices follow numpy's 'lower' quantile method, floor((N - 1) * q),
+		# which always stays in range (including N == 1)
+		k50, k95, k99 = (int((count - 1) * q) for q in (0.5, 0.95, 0.99))
+		partitioned = np.partition(values, [k50, k95, k99])
+		total = float(values.sum())
 
 		return {
-			'count': len(filtered),
-			'min': min(values),
-			'max': max(values),
-			'mean': sum(values) / len(values),
-			'median': sorted(values)[len(values) // 2],
-			'p95': sorted(values)[int(len(values) * 0.95)],
-			'p99': sorted(values)[int(len(values) * 0.99)],
-			'sum': sum(values),
+			'count': count,
+			'min': float(values.min()),
+			'max': float(values.max()),
+			'mean': total / count,
+			'median': float(partitioned[k50]),
+			'p95': float(partitioned[k95]),
+			'p99': float(partitioned[k99]),
+			'sum': total,
 		}
 
 	def get_operation_stats(self, minutes: int = 60) -> Dict:
@@ -170,25 +443,24 @@ class PerformanceMonitor:
 		"""
 		cutoff_time = time.time() - (minutes * 60) if minutes > 0 else 0
 		
-		# Group by operation and metric
-		grouped = defaultdict(lambda: defaultdict(list))
-		
-		for event in self.events:
-			if event.timestamp >= cutoff_time:
-				grouped[event.operation][event.metric_name].append(event.value)
+		# Series are already grouped by (operation, metric) at insert time,
+		# each one only needs its reductions computed by numpy
+		with self._lock:
+			self._trim_indexes()
+			windows = [
+				(key, self._series_window(series, cutoff_time))
+				for key, series in self._series.items()
+			]
 
-		# Calculate stats
 		stats = {}
-		for op_name, metrics in grouped.items():
-			stats[op_name] = {}
-			for metric_name, values in metrics.items():
-				if values:
-					stats[op_name][metric_name] = {
-						'count': len(values),
-						'mean': sum(values) / len(values),
-						'min': min(values),
-						'max': max(values),
-					}
+		for (op_name, metric_name), values in windows:
+			if len(values):
+				stats.setdefault(op_name, {})[metric_name] = {
+					'count': len(values),
+					'mean': float(values.mean()),
+					'min': float(values.min()),
+					'max': float(values.max()),
+				}
 
 		return stats
 
@@ -203,17 +475,10 @@ class PerformanceMonitor:
 		"""
 		cutoff_time = time.time() - (minutes * 60) if minutes > 0 else 0
 
-		cache_events = [
-			e for e in self.events
-			if e.timestamp >= cutoff_time
-			and e.operation == 'cache_lookup'
-		]
-
-		if not cache_events:
-			return {'hit_count': 0, 'miss_count': 0, 'hit_rate': 0}
-
-		hit_count = sum(1 for e in cache_events if e.metric_name == 'cache_hit')
-		miss_count = sum(1 for e in cache_events if e.metric_name == 'cache_miss')
+		with self._lock:
+			self._trim_indexes()
+			hit_count = self._window_count('cache_lookup', 'cache_hit', cutoff_time)
+			miss_count = self._window_count('cache_lookup', 'cache_miss', cutoff_time)
 		total = hit_count + miss_count
 
 		return {
@@ -222,6 +487,14 @@ class PerformanceMonitor:
 			'hit_rate': hit_count / total if total > 0 else 0,
 		}
 
+	def _window_count(self, operation: str, metric_name: str, cutoff_time: float) -> int:
+		"""Number of events of one series recorded at or after cutoff_time."""
+		series = self._series.get((operation, metric_name))
+		if series is None:
+			return 0
+		series_ts = series[0]
+		return len(series_ts) - bisect_left(series_ts, cutoff_time)
+
 	def get_error_statistics(self, minutes: int = 60) -> Dict:
 		"""Get error statistics.
 		
@@ -233,11 +506,14 @@ class PerformanceMonitor:
 		"""
 		cutoff_time = time.time() - (minutes * 60) if minutes > 0 else 0
 
-		error_events = [
-			e for e in self.events
-			if e.timestamp >= cutoff_time
-			and 'error' in e.metric_name.lower()
-		]
+		# Only walk the events inside the time window (newest first)
+		with self._lock:
+			self._trim_indexes()
+			window_size = len(self._timestamps) - bisect_left(self._timestamps, cutoff_time)
+			error_events = [
+				e for e in islice(reversed(self.events), window_size)
+				if 'error' in e.metric_name.lower()
+			]
 
 		if not error_events:
 			return {}
@@ -251,42 +527,55 @@ class PerformanceMonitor:
 		return dict(errors_by_type)
 
 	def export_metrics(self, filepath: Path):
-		"""Export collected metrics to JSON file.
+		"""Export collected metrics to a JSON Lines file (one event per line).
+		
+		Events are streamed to disk one by one, without building the whole
+		document in memory.
 		
 		Args:
 			filepath: Path to export to
 		"""
+		with self._lock:
+			events = list(self.events)
+
 		try:
-			with open(filepath, 'w') as f:
-				json.dump(
-					[e.to_dict() for e in self.events],
-					f,
-					indent=2,
-					default=str
-				)
-			log.info(f"Exported {len(self.events)} metrics to {filepath}")
+			with open(filepath, 'wb') as f:
+				for e in events:
+					f.write(_dumps_line(e.to_dict()))
+			log.info(f"Exported {len(events)} metrics to {filepath}")
 		except Exception as e:
 			log.error(f"Failed to export metrics: {e}")
 
 	def import_metrics(self, filepath: Path):
-		"""Import metrics from JSON file.
+		"""Import metrics from a JSON Lines file.
+		
+		Files written by older versions (a single JSON array) are also accepted.
 		
 		Args:
 			filepath: Path to import from
 		"""
 		try:
-			with open(filepath, 'r') as f:
-				data = json.load(f)
-			
-			for item in data:
-				event = MetricEvent(
-					timestamp=item['timestamp'],
-					operation=item['operation'],
-					metric_name=item['metric_name'],
-					value=item['value'],
-					metadata=item.get('metadata')
-				)
-				self.events.append(event)
+			with open(filepath, 'rb') as f:
+				if f.read(1).lstrip() == b'[':
+					f.seek(0)
+					data = _loads(f.read())
+				else:
+					f.seek(0)
+					data = [_loads(line) for line in f if line.strip()]
+
+			with self._lock:
+				for item in data:
+					event = MetricEvent(
+						timestamp=item['timestamp'],
+						operation=item['operation'],
+						metric_name=item['metric_name'],
+						value=item['value'],
+						metadata=item.get('metadata')
+					)
+					self.events.append(event)
+				
+				# Imported events may be older than the recorded ones
+				self._rebuild_indexes()
 			
 			log.info(f"Imported {len(data)} metrics from {filepath}")
 		except Exception as e:
@@ -294,7 +583,11 @@ class PerformanceMonitor:
 
 	def clear_metrics(self):
 		"""Clear all collected metrics."""
-		self.events.clear()
+		with self._lock:
+			self.events.clear()
+			self._timestamps = array('d')
+			self._series = {}
+			self._evicted.clear()
 		log.info("Cleared all metrics")
 
 
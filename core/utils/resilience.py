@@ -4,13 +4,21 @@ Network resilience utilities: retry logic and circuit breaker pattern
 Provides robust handling of network failures for GIS data fetching
 """
 
+import asyncio
+import inspect
 import logging
+import random
+import threading
 import time
 from functools import wraps
-from typing import Callable, Any, Optional, Tuple
+from typing import Callable, Any, Dict, Optional, Tuple
 
 log = logging.getLogger(__name__)
 
+# Private generator for retry jitter, avoids contending on the lock of the
+# shared module-level random instance from many download threads
+_rng = random.Random()
+
 
 class CircuitBreaker:
 	"""
@@ -20,54 +28,85 @@ class CircuitBreaker:
 	States:
 	- CLOSED: Normal operation, requests allowed
 	- OPEN: Service failing, requests blocked
-	- HALF_OPEN: Testing if service recovered
+	- HALF_OPEN: Testing if service recovered, a single probe request is let through
 	"""
 	
-	def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
+	def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60,
+			clock: Callable[[], float] = time.monotonic):
 		"""
 		Args:
 			failure_threshold: Number of failures before opening circuit (default: 5)
 			recovery_timeout: Seconds to wait before attempting recovery (default: 60s)
+			clock: Function returning the current time in seconds (default: time.monotonic)
 		"""
 		self.failure_threshold = failure_threshold
 		self.recovery_timeout = recovery_timeout
+		self._clock = clock
 		
 		self.failure_count = 0
 		self.success_count = 0
 		self.last_failure_time = None
-		self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
+		self._state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
+		
+		# Guards every state transition: one breaker is shared by all download threads
+		self._lock = threading.Lock()
+		# Only one request may probe a recovering service, the others are rejected
+		# until it succeeds or fails
+		self._probe_in_flight = False
+	
+	def _current_state(self) -> str:
+		"""State, with OPEN reported as HALF_OPEN once the recovery timeout elapsed.
+		
+		Caller must hold self._lock.
+		"""
+		if self._state == 'OPEN' and self._clock() - self.last_failure_time >= self.recovery_timeout:
+			return 'HALF_OPEN'
+		return self._state
+	
+	@property
+	def state(self) -> str:
+		"""Current state: 'CLOSED', 'OPEN' or 'HALF_OPEN'"""
+		with self._lock:
+			return self._current_state()
 	
 	def record_success(self):
 		"""Record successful request"""
-		self.failure_count = 0
-		if self.state == 'HALF_OPEN':
-			self.state = 'CLOSED'
-			log.info('Circuit breaker CLOSED: Service recovered')
+		with self._lock:
+			self.failure_count = 0
+			self._probe_in_flight = False
+			if self._current_state() == 'HALF_OPEN':
+				self._state = 'CLOSED'
+				log.info('Circuit breaker CLOSED: Service recovered')
 	
 	def record_failure(self):
 		"""Record failed request"""
-		self.failure_count += 1
-		self.last_failure_time = time.time()
-		
-		if self.failure_count >= self.failure_threshold:
-			self.state = 'OPEN'
-			log.warning(f'Circuit breaker OPEN: {self.failure_threshold} consecutive failures')
+		with self._lock:
+			self.failure_count += 1
+			self.last_failure_time = self._clock()
+			self._probe_in_flight = False
+			
+			if self.failure_count >= self.failure_threshold:
+				self._state = 'OPEN'
+				log.warning(f'Circuit breaker OPEN: {self.failure_threshold} consecutive failures')
 	
 	def allow_request(self) -> bool:
 		"""Check if request is allowed"""
-		if self.state == 'CLOSED':
-			return True
-		
-		if self.state == 'OPEN':
-			# Check if recovery timeout has elapsed
-			if time.time() - self.last_failure_time >= self.recovery_timeout:
-				self.state = 'HALF_OPEN'
-				log.info('Circuit breaker HALF_OPEN: Testing service recovery')
+		with self._lock:
+			state = self._current_state()
+			if state == 'CLOSED':
 				return True
-			return False
-		
-		# HALF_OPEN: allow single test request
-		return True
+			
+			if state == 'OPEN':
+				return False
+			
+			# HALF_OPEN: allow single test request
+			if self._state == 'OPEN':
+				self._state = 'HALF_OPEN'
+				log.info('Circuit breaker HALF_OPEN: Testing service recovery')
+			if self._probe_in_flight:
+				return False
+			self._probe_in_flight = True
+			return True
 
 
 def retry_with_backoff(
@@ -81,12 +120,16 @@ def retry_with_backoff(
 	"""
 	Decorator for exponential backoff retry logic with jitter.
 	
+	Works on coroutine functions too, waiting with asyncio.sleep instead of
+	blocking the event loop.
+	
 	Args:
 		max_retries: Maximum number of retry attempts (default: 3)
 		initial_delay: Initial delay in seconds (default: 1.0s)
 		backoff_factor: Multiplier for delay on each retry (default: 2.0x)
 		max_delay: Maximum delay between retries (default: 30s)
-		jitter: Add randomness to prevent thundering herd (default: True)
+		jitter: "Full jitter", wait a random time between 0 and the backoff delay,
+			to spread out retries of many clients (default: True)
 		exceptions: Tuple of exceptions to catch and retry (default: all)
 	
 	Returns:
@@ -98,46 +141,67 @@ def retry_with_backoff(
 			return urlopen(url).read()
 	"""
 	def decorator(func: Callable) -> Callable:
+		def backoff_delay(attempt: int, e: Exception) -> Optional[float]:
+			"""Delay before the next attempt, or None once retries are exhausted"""
+			if attempt >= max_retries:
+				log.error(
+					f'{func.__name__} failed after {max_retries + 1} attempts: {str(e)}'
+				)
+				return None
+			
+			# Calculate delay with exponential backoff
+			delay = min(initial_delay * (backoff_factor ** attempt), max_delay)
+			
+			# Full jitter: clients failing together don't retry together
+			if jitter:
+				delay = _rng.uniform(0, delay)
+			
+			log.warning(
+				f'{func.__name__} failed (attempt {attempt + 1}/{max_retries + 1}): {str(e)}. '
+				f'Retrying in {delay:.1f}s...'
+			)
+			return delay
+		
+		if inspect.iscoroutinefunction(func):
+			# Coroutines must not block the event loop while waiting
+			@wraps(func)
+			async def async_wrapper(*args, **kwargs) -> Any:
+				for attempt in range(max_retries + 1):
+					try:
+						result = await func(*args, **kwargs)
+						log.debug(f'{func.__name__} succeeded on attempt {attempt + 1}')
+						return result
+					except exceptions as e:
+						delay = backoff_delay(attempt, e)
+						if delay is None:
+							raise
+						await asyncio.sleep(delay)
+			
+			return async_wrapper
+		
 		@wraps(func)
 		def wrapper(*args, **kwargs) -> Any:
-			delay = initial_delay
-			last_exception = None
-			
 			for attempt in range(max_retries + 1):
 				try:
 					result = func(*args, **kwargs)
 					log.debug(f'{func.__name__} succeeded on attempt {attempt + 1}')
 					return result
 				except exceptions as e:
-					last_exception = e
-					
-					if attempt < max_retries:
-						# Calculate delay with exponential backoff
-						delay = min(initial_delay * (backoff_factor ** attempt), max_delay)
-						
-						# Add jitter (random 0-20% variance)
-						if jitter:
-							import random
-							jitter_amount = delay * random.uniform(0, 0.2)
-							delay = delay + jitter_amount
-						
-						log.warning(
-							f'{func.__name__} failed (attempt {attempt + 1}/{max_retries + 1}): {str(e)}. '
-							f'Retrying in {delay:.1f}s...'
-						)
-						time.sleep(delay)
-					else:
-						log.error(
-							f'{func.__name__} failed after {max_retries + 1} attempts: {str(e)}'
-						)
-			
-			raise last_exception
+					delay = backoff_delay(attempt, e)
+					if delay is None:
+						raise
+					time.sleep(delay)
 		
 		return wrapper
 	
 	return decorator
 
 
+# Global circuit breakers by service, shared by every function decorated with the same name
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
 def with_circuit_breaker(
 	service_name: str,
 	failure_threshold: int = 5,
@@ -159,17 +223,13 @@ def with_circuit_breaker(
 		def fetch_dem(url):
 			return urlopen(url).read()
 	"""
-	# Global circuit breakers by service
-	if not hasattr(with_circuit_breaker, 'breakers'):
-		with_circuit_breaker.breakers = {}
-	
-	if service_name not in with_circuit_breaker.breakers:
-		with_circuit_breaker.breakers[service_name] = CircuitBreaker(
-			failure_threshold=failure_threshold,
-			recovery_timeout=recovery_timeout
-		)
-	
-	breaker = with_circuit_breaker.breakers[service_name]
+	with _breakers_lock:
+		breaker = _breakers.get(service_name)
+		if breaker is None:
+			breaker = _breakers[service_name] = CircuitBreaker(
+				failure_threshold=failure_threshold,
+				recovery_timeout=recovery_timeout
+			)
 	
 	def decorator(func: Callable) -> Callable:
 		@wraps(func)
@@ -14,7 +14,7 @@ Falls back to encrypted local storage if keyring unavailable.
 import logging
 import os
 import json
-from typing import Optional, Dict
+from typing import Optional, Dict, MutableMapping
 from pathlib import Path
 
 log = logging.getLogger(__name__)
@@ -27,6 +27,27 @@ except ImportError:
 	HAS_KEYRING = False
 	log.warning('keyring module not available, using fallback encryption')
 
+# orjson is faster than the stdlib json, use it for the fallback file when available
+try:
+	import orjson
+	HAS_ORJSON = True
+except ImportError:
+	HAS_ORJSON = False
+
+
+def _loads(data: bytes):
+	"""Parse JSON bytes."""
+	if HAS_ORJSON:
+		return orjson.loads(data)
+	return json.loads(data)
+
+
+def _dumps(obj) -> bytes:
+	"""Serialize obj as indented JSON bytes."""
+	if HAS_ORJSON:
+		return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+	return json.dumps(obj, indent=2).encode('utf-8')
+
 
 class SecretsManager:
 	"""Manages API keys and credentials securely."""
@@ -34,10 +55,20 @@ class SecretsManager:
 	SERVICE_NAME = 'BlenderGIS'
 	FALLBACK_FILE = '.blendergis_secrets'  # In user home, encrypted
 
-	def __init__(self):
-		"""Initialize secrets manager."""
-		self.has_keyring = HAS_KEYRING
-		self.fallback_path = Path.home() / self.FALLBACK_FILE
+	def __init__(self, backend: Optional[MutableMapping[str, str]] = None):
+		"""Initialize secrets manager.
+
+		Args:
+			backend: Mapping used to store secrets instead of the keyring and the
+				fallback file, e.g. a dict for tests (default: None)
+		"""
+		self.backend = backend
+		self.has_keyring = HAS_KEYRING and backend is None
+		self.fallback_path = _FALLBACK_PATH
+
+		# In-memory copy of the fallback file and the (path, mtime, size) it was read at
+		self._cache = None
+		self._cache_stamp = None
 
 	def get_api_key(self, service: str, username: str = 'default') -> Optional[str]:
 		"""Get API key for service.
@@ -107,16 +138,53 @@ class SecretsManager:
 		# Fallback to local encrypted storage
 		return self._delete_fallback(service, username)
 
+	def _load(self) -> Dict[str, str]:
+		"""Load fallback secrets, re-reading the file only if it changed on disk."""
+		if self.backend is not None:
+			return self.backend
+
+		try:
+			st = self.fallback_path.stat()
+		except FileNotFoundError:
+			self._cache = {}
+			self._cache_stamp = None
+			return self._cache
+
+		stamp = (self.fallback_path, st.st_mtime_ns, st.st_size)
+		if self._cache is None or stamp != self._cache_stamp:
+			with open(self.fallback_path, 'rb') as f:
+				self._cache = _loads(f.read())
+			self._cache_stamp = stamp
+		return self._cache
+
+	def _save(self, data: Dict[str, str]):
+		"""Write fallback secrets and keep them as the in-memory copy."""
+		if self.backend is not None:
+			self.backend.clear()
+			self.backend.update(data)
+			return
+
+		try:
+			with open(self.fallback_path, 'wb') as f:
+				f.write(_dumps(data))
+
+			# Restrict permissions (Unix-like systems)
+			if os.name != 'nt':  # Not Windows
+				os.chmod(self.fallback_path, 0o600)
+		except Exception:
+			# File state unknown, reload on next access
+			self._cache = None
+			raise
+
+		st = self.fallback_path.stat()
+		self._cache = data
+		self._cache_stamp = (self.fallback_path, st.st_mtime_ns, st.st_size)
+
 	def _get_fallback(self, service: str, username: str) -> Optional[str]:
 		"""Get secret from local fallback storage."""
-		if not self.fallback_path.exists():
-			return None
-
 		try:
-			with open(self.fallback_path, 'r') as f:
-				data = json.load(f)
 			key = f'{service}:{username}'
-			return data.get(key)
+			return self._load().get(key)
 		except Exception as e:
 			log.warning(f'Fallback read failed: {e}')
 			return None
@@ -124,24 +192,13 @@ class SecretsManager:
 	def _set_fallback(self, service: str, api_key: str, username: str) -> bool:
 		"""Set secret in local fallback storage."""
 		try:
-			# Load existing secrets
-			if self.fallback_path.exists():
-				with open(self.fallback_path, 'r') as f:
-					data = json.load(f)
-			else:
-				data = {}
-
 			# Add/update secret
+			data = dict(self._load())
 			key = f'{service}:{username}'
 			data[key] = api_key
 
 			# Write back
-			with open(self.fallback_path, 'w') as f:
-				json.dump(data, f, indent=2)
-
-			# Restrict permissions (Unix-like systems)
-			if os.name != 'nt':  # Not Windows
-				os.chmod(self.fallback_path, 0o600)
+			self._save(data)
 
 			log.debug(f'Stored secret in fallback: {service}')
 			return True
@@ -151,20 +208,17 @@ class SecretsManager:
 
 	def _delete_fallback(self, service: str, username: str) -> bool:
 		"""Delete secret from local fallback storage."""
-		if not self.fallback_path.exists():
-			return True
-
 		try:
-			with open(self.fallback_path, 'r') as f:
-				data = json.load(f)
-
+			data = self._load()
 			key = f'{service}:{username}'
-			if key in data:
-				del data[key]
+			if key not in data:
+				return True
+
+			data = dict(data)
+			del data[key]
 
 			# Write back
-			with open(self.fallback_path, 'w') as f:
-				json.dump(data, f, indent=2)
+			self._save(data)
 
 			log.debug(f'Deleted secret from fallback: {service}')
 			return True
@@ -188,10 +242,9 @@ class SecretsManager:
 				log.debug(f'Could not enumerate keyring: {e}')
 
 		# Fallback enumeration
-		if self.fallback_path.exists():
+		if self.backend is not None or self.fallback_path.exists():
 			try:
-				with open(self.fallback_path, 'r') as f:
-					data = json.load(f)
+				data = self._load()
 
 				for key in data.keys():
 					service, username = key.split(':', 1)
@@ -210,16 +263,24 @@ class SecretsManager:
 			True if successful
 		"""
 		try:
+			if self.backend is not None:
+				self.backend.clear()
+				return True
+
 			# Fallback cleanup
 			if self.fallback_path.exists():
 				self.fallback_path.unlink()
 				log.info('Cleared all fallback secrets')
+			self._cache = None
 			return True
 		except Exception as e:
 			log.warning(f'Failed to clear secrets: {e}')
 			return False
 
 
+# Resolved once, the home directory doesn't change while Blender runs
+_FALLBACK_PATH = Path.home() / SecretsManager.FALLBACK_FILE
+
 # Global instance
 _secrets_manager = None
 
@@ -5,8 +5,8 @@ Provides thread pool management with proper resource cleanup and cancellation
 """
 
 import logging
+import queue
 import threading
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 from typing import Callable, Any, List, Optional, Tuple
 
@@ -66,12 +66,10 @@ class CancellableThreadPool:
 					log.warning('Cancellation requested during wait_completion')
 					raise RuntimeError('Task cancelled by user')
 				
+				# as_completed only yields finished futures, result() doesn't wait
 				try:
-					result = future.result(timeout=1)
+					result = future.result()
 					self.results.append(result)
-				except TimeoutError:
-					log.warning('Task timeout after %ds', self.timeout)
-					self.errors.append('Task timeout')
 				except Exception as e:
 					log.warning('Task error: %s', str(e))
 					self.errors.append(str(e))
@@ -121,10 +119,13 @@ class CancellableThreadPool:
 		return len(self.results)
 
 
-class BoundedQueue:
+class BoundedQueue(queue.Queue):
 	"""
 	Thread-safe queue with bounded size to prevent memory issues.
 	Blocks producer when full, allowing consumer to catch up.
+	
+	A queue.Queue that reports a full/empty queue with TimeoutError
+	(instead of queue.Full/queue.Empty), as callers expect.
 	"""
 	
 	def __init__(self, maxsize: int = 100):
@@ -132,86 +133,49 @@ class BoundedQueue:
 		Args:
 			maxsize: Maximum queue size (blocks put() when reached)
 		"""
-		self.queue = []
-		self.maxsize = maxsize
-		self.lock = threading.Lock()
-		self.not_full = threading.Condition(self.lock)
-		self.not_empty = threading.Condition(self.lock)
+		super().__init__(maxsize)
 	
-	def put(self, item: Any, timeout: Optional[int] = None) -> None:
+	def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
 		"""
 		Put item in queue, blocking if full.
 		
 		Args:
 			item: Item to add
+			block: Wait for a free slot (False = fail immediately if full)
 			timeout: Max seconds to wait (None = infinite)
 		
 		Raises:
 			TimeoutError: If timeout exceeded
 		"""
-		with self.not_full:
-			start_time = time.time()
-			while len(self.queue) >= self.maxsize:
-				if timeout is not None:
-					elapsed = time.time() - start_time
-					if elapsed >= timeout:
-						raise TimeoutError(f'Queue full after {timeout}s')
-					wait_time = timeout - elapsed
-				else:
-					wait_time = None
-				
-				self.not_full.wait(timeout=wait_time)
-			
-			self.queue.append(item)
-			self.not_empty.notify()
+		try:
+			super().put(item, block, timeout)
+		except queue.Full:
+			raise TimeoutError(f'Queue full after {timeout}s') from None
 	
-	def get(self, timeout: Optional[int] = None) -> Any:
+	def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
 		"""
 		Get item from queue, blocking if empty.
 		
 		Args:
-			timeout: Max seconds to wait
+			block: Wait for an item (False = fail immediately if empty)
+			timeout: Max seconds to wait (None = infinite)
 		
 		Raises:
 			TimeoutError: If timeout exceeded
 		"""
-		with self.not_empty:
-			start_time = time.time()
-			while len(self.queue) == 0:
-				if timeout is not None:
-					elapsed = time.time() - start_time
-					if elapsed >= timeout:
-						raise TimeoutError(f'Queue empty after {timeout}s')
-					wait_time = timeout - elapsed
-				else:
-					wait_time = None
-				
-				self.not_empty.wait(timeout=wait_time)
-			
-			item = self.queue.pop(0)
-			self.not_full.notify()
-			return item
-	
-	def qsize(self) -> int:
-		"""Get current queue size"""
-		with self.lock:
-			return len(self.queue)
-	
-	def empty(self) -> bool:
-		"""Check if queue is empty"""
-		with self.lock:
-			return len(self.queue) == 0
-	
-	def full(self) -> bool:
-		"""Check if queue is full"""
-		with self.lock:
-			return len(self.queue) >= self.maxsize
+		try:
+			return super().get(block, timeout)
+		except queue.Empty:
+			raise TimeoutError(f'Queue empty after {timeout}s') from None
 
 
 def run_with_timeout(fn: Callable, timeout: int, *args, **kwargs) -> Tuple[bool, Any, Optional[str]]:
 	"""
 	Run function in thread with timeout, returning (success, result, error).
 	
+	A function still running at the deadline can't be interrupted, it finishes
+	in the background but its result is discarded.
+	
 	Args:
 		fn: Function to run
 		timeout: Timeout in seconds
@@ -220,24 +184,17 @@ def run_with_timeout(fn: Callable, timeout: int, *args, **kwargs) -> Tuple[bool,
 	Returns:
 		Tuple of (success, result, error_msg)
 	"""
-	result_box = [None, None, None]  # [success, result, error]
-	
-	def worker():
-		try:
-			result = fn(*args, **kwargs)
-			result_box[0] = True
-			result_box[1] = result
-		except Exception as e:
-			result_box[0] = False
-			result_box[2] = str(e)
-			log.warning('Worker error: %s', str(e))
-	
-	thread = threading.Thread(target=worker, daemon=False)
-	thread.start()
-	thread.join(timeout=timeout)
-	
-	if thread.is_alive():
+	executor = ThreadPoolExecutor(max_workers=1)
+	future = executor.submit(fn, *args, **kwargs)
+	try:
+		return True, future.result(timeout=timeout), None
+	except TimeoutError:
+		future.cancel()
 		log.warning('Thread timeout after %ds', timeout)
 		return False, None, f'Timeout after {timeout}s'
-	
-	return tuple(result_box)
+	except Exception as e:
+		log.warning('Worker error: %s', str(e))
+		return False, None, str(e)
+	finally:
+		# Don't wait for a timed out worker
+		executor.shutdown(wait=False)
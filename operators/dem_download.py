@@ -4,17 +4,110 @@ DEM Download Helpers with Resilience
 Handles network retries and circuit breaker for elevation data queries
 """
 
+import gzip
+import hashlib
+import json
 import logging
 import os
-from urllib.request import Request, urlopen
+import shutil
+import tempfile
+from typing import Callable, List, Optional, Tuple
+from urllib.error import URLError, HTTPError
 
 log = logging.getLogger(__name__)
 
+# Advisory file locks, released by the OS if the process dies
+try:
+	import fcntl
+except ImportError:  # Windows
+	fcntl = None
+	import msvcrt
+
 from ..core.utils.resilience import retry_with_backoff, with_circuit_breaker
+from ..core.utils.http_pool import open_url, close_connections
+from ..core.utils.threading_utils import CancellableThreadPool
 
 
 TIMEOUT = 120
 
+COPY_BUFFER_SIZE = 1024 * 1024  # 1MB, DEM files are several MB
+
+
+def _remove(path: str):
+	"""Delete path, ignoring a missing file."""
+	try:
+		os.unlink(path)
+	except FileNotFoundError:
+		pass
+
+
+def _lock_part(part_path: str) -> Optional[int]:
+	"""
+	Lock part_path for this download, None if another download holds it.
+	
+	The lock is an OS advisory lock on <part_path>.lock: the OS releases it
+	when the process dies, so a crash never leaves a stale lock behind.
+	"""
+	lock_path = part_path + '.lock'
+	lock = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+	try:
+		if fcntl is not None:
+			fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+		else:
+			msvcrt.locking(lock, msvcrt.LK_NBLCK, 1)
+		# The lock file may have been swept between open and lock
+		if not os.path.samestat(os.fstat(lock), os.stat(lock_path)):
+			raise OSError(f'{lock_path} was replaced')
+	except OSError:
+		os.close(lock)
+		return None
+	return lock
+
+
+def _unlock_part(part_path: str, lock: int):
+	"""Release a lock taken with _lock_part and delete its lock file."""
+	if fcntl is not None:
+		# Unlink while still locked, so no other download locks the old file
+		_remove(part_path + '.lock')
+		os.close(lock)
+	else:
+		# Windows can't delete an open file
+		os.lseek(lock, 0, os.SEEK_SET)
+		msvcrt.locking(lock, msvcrt.LK_UNLCK, 1)
+		os.close(lock)
+		try:
+			_remove(part_path + '.lock')
+		except OSError:
+			pass
+
+
+def _sweep_parts(filepath: str):
+	"""Delete the .part files left next to filepath by downloads no longer running."""
+	directory, name = os.path.split(filepath)
+	part_paths = set()
+	for entry in os.scandir(directory or '.'):
+		if entry.name.startswith(name + '.') and entry.name.endswith(('.part', '.part.lock')):
+			part_paths.add(os.path.join(directory, entry.name[:entry.name.index('.part') + 5]))
+	for part_path in part_paths:
+		# A running download (this one included) holds the lock of its part file
+		lock = _lock_part(part_path)
+		if lock is not None:
+			log.debug(f'Removing abandoned partial download {part_path}')
+			_remove(part_path)
+			_unlock_part(part_path, lock)
+
+
+def _cached_etag(etag_path: str, url: str) -> Optional[str]:
+	"""ETag saved with the last file downloaded from url, None if unknown."""
+	try:
+		with open(etag_path) as f:
+			cached = json.load(f)
+	except (OSError, ValueError):
+		return None
+	if cached.get('url') != url:
+		return None
+	return cached.get('etag')
+
 
 @retry_with_backoff(
 	max_retries=3,
@@ -31,7 +124,15 @@ def download_dem_file(url: str, filepath: str, user_agent: str, timeout: int = T
 	The function will:
 	1. Retry up to 3 times with exponential backoff (1s, 2s, 4s, max 10s)
 	2. Apply circuit breaker to prevent cascading failures
-	3. Log all attempts and failures
+	3. Reuse a keep-alive connection to the server across calls (per thread)
+	   and accept gzip-compressed responses
+	4. Log all attempts and failures
+	5. Write to a .part file next to filepath and rename it on success,
+	   so a failed download never leaves a partial file at filepath
+	   (a concurrent download of the same file writes to a unique one instead)
+	6. Resume an interrupted download with an HTTP Range request
+	7. Skip the transfer when the server reports (ETag) that the file
+	   already downloaded from the same URL is unchanged
 	
 	Args:
 		url: URL to download DEM from
@@ -58,17 +159,154 @@ def download_dem_file(url: str, filepath: str, user_agent: str, timeout: int = T
 	# Create directory if needed
 	os.makedirs(os.path.dirname(filepath), exist_ok=True)
 	
-	# Download with retry/circuit breaker decorators
-	rq = Request(url, headers={'User-Agent': user_agent})
-	with urlopen(rq, timeout=timeout) as response:
-		with open(filepath, 'wb') as outFile:
-			# Stream large files in chunks
-			chunk_size = 8192
-			while True:
-				chunk = response.read(chunk_size)
-				if not chunk:
-					break
-				outFile.write(chunk)
+	# Partial data is kept between attempts under a name tied to the URL, so a
+	# retry resumes where the previous attempt stopped and never appends to the
+	# data of another query saved to the same filepath
+	part_path = f'{filepath}.{hashlib.sha1(url.encode()).hexdigest()[:12]}.part'
+	lock = _lock_part(part_path)
+	resumable = lock is not None
+	if not resumable:
+		# Another download of the same URL to the same file holds the partial
+		# data, leave it alone and download from scratch to a unique file,
+		# locked too so it is not swept while in use
+		fd, part_path = tempfile.mkstemp(
+			prefix=os.path.basename(filepath) + '.', suffix='.part', dir=os.path.dirname(filepath)
+		)
+		os.close(fd)
+		lock = _lock_part(part_path)
+		offset = 0
+	else:
+		offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
 	
-	log.info(f'Successfully downloaded DEM to: {filepath}')
-	return True
+	try:
+		headers = {'User-Agent': user_agent}
+		# The file is reused by every query, only revalidate it for the URL it came from
+		etag_path = filepath + '.etag'
+		etag = _cached_etag(etag_path, url) if os.path.exists(filepath) else None
+		if etag and not offset:
+			headers['If-None-Match'] = etag
+		if offset:
+			log.info(f'Resuming DEM download at byte {offset}')
+			headers['Range'] = f'bytes={offset}-'
+			# Byte ranges apply to the encoded body, don't mix them with gzip
+			headers['Accept-Encoding'] = 'identity'
+		else:
+			# DEM rasters compress well, let the server gzip them
+			headers['Accept-Encoding'] = 'gzip'
+		
+		# Download with retry/circuit breaker decorators, over a keep-alive
+		# connection reused by the next query to the same server
+		try:
+			response = open_url(url, headers, timeout)
+		except HTTPError as e:
+			if e.code == 416:
+				# Range not satisfiable, the partial data is stale: start over next attempt
+				_remove(part_path)
+			raise
+		
+		if response.status == 304:
+			response.close()
+			log.info(f'DEM unchanged on server, keeping: {filepath}')
+			return True
+		
+		with response:
+			# 206: server honoured the Range, 200: full body (no resume support)
+			resumed = response.status == 206
+			if resumed and not response.headers.get('Content-Range', '').startswith(f'bytes {offset}-'):
+				_remove(part_path)
+				raise URLError(f"Unexpected Content-Range {response.headers.get('Content-Range')!r} resuming at {offset}")
+			compressed = response.headers.get('Content-Encoding', '').lower() == 'gzip'
+			source = gzip.GzipFile(fileobj=response) if compressed else response
+			try:
+				with open(part_path, 'ab' if resumed else 'wb', buffering=COPY_BUFFER_SIZE) as outFile:
+					try:
+						# Reserve the whole file up front when the size is known (limits fragmentation),
+						# with gzip Content-Length is the compressed size so it's no use
+						size = response.headers.get('Content-Length')
+						if size and size.isdigit() and not resumed and not compressed and hasattr(os, 'posix_fallocate'):
+							try:
+								os.posix_fallocate(outFile.fileno(), 0, int(size))
+							except OSError as e:
+								log.debug(f'Cannot preallocate {filepath}: {e}')
+						# Stream large files in big chunks, the copy loop runs in C
+						shutil.copyfileobj(source, outFile, length=COPY_BUFFER_SIZE)
+						# read() reports a connection closed early as a plain EOF
+						if response.length:
+							raise URLError(f'Connection closed with {response.length} bytes left to read')
+					finally:
+						# Drop any preallocated space past what was actually received,
+						# the size of the part file is the resume offset
+						outFile.truncate()
+			except BaseException:
+				if compressed:
+					# Decompressed output can't be resumed with a byte range
+					_remove(part_path)
+				# The body was not fully read, the connection can't be reused
+				close_connections()
+				raise
+		
+		os.replace(part_path, filepath)
+		# Partial data of failed or interrupted downloads to this file is stale now
+		_sweep_parts(filepath)
+		
+		etag = response.headers.get('ETag')
+		if etag:
+			with open(etag_path, 'w') as f:
+				json.dump({'url': url, 'etag': etag}, f)
+		else:
+			_remove(etag_path)
+		
+		log.info(f'Successfully downloaded DEM to: {filepath}')
+		return True
+	finally:
+		if not resumable:
+			# A unique file is never resumed, drop it if it was not renamed
+			_remove(part_path)
+		if lock is not None:
+			_unlock_part(part_path, lock)
+
+
+def _download_dem_task(url: str, filepath: str, user_agent: str, timeout: int) -> bool:
+	"""Pool task: download one DEM, then close the worker thread's keep-alive connections."""
+	try:
+		return download_dem_file(url, filepath, user_agent, timeout=timeout)
+	finally:
+		close_connections()
+
+
+def download_dem_files(
+	downloads: List[Tuple[str, str]],
+	user_agent: str,
+	max_workers: int = 8,
+	timeout: int = TIMEOUT,
+	callback_progress: Optional[Callable] = None
+) -> Tuple[List, List]:
+	"""
+	Download several DEM files (e.g. the SRTM tiles covering a bbox) in parallel.
+	
+	Network latency dominates DEM queries, so concurrent downloads give a near
+	linear speedup up to the server's rate limit. Each download keeps the retry
+	and circuit breaker protection of download_dem_file.
+	
+	Args:
+		downloads: List of (url, filepath) pairs
+		user_agent: User agent string for HTTP requests
+		max_workers: Number of concurrent downloads (default: 8)
+		timeout: Request timeout in seconds, per download
+		callback_progress: Optional function(completed_count, total_count),
+			e.g. to update the status bar
+	
+	Returns:
+		Tuple of (results, errors) as returned by CancellableThreadPool.wait_completion
+	
+	Example:
+		results, errors = download_dem_files(
+			[(url1, '/tmp/n45e006.tif'), (url2, '/tmp/n45e007.tif')],
+			'BlenderGIS/2.2.13'
+		)
+	"""
+	# Worst case every download runs back to back on one worker
+	pool = CancellableThreadPool(max_workers=max_workers, timeout=timeout * max(1, len(downloads)))
+	for url, filepath in downloads:
+		pool.submit_task(_download_dem_task, url, filepath, user_agent, timeout)
+	return pool.wait_completion(callback_progress)
@@ -4,7 +4,6 @@ import time
 import logging
 log = logging.getLogger(__name__)
 
-from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
 import bpy
@@ -15,7 +14,8 @@ from bpy.props import StringProperty, IntProperty, FloatProperty, BoolProperty,
 from ..geoscene import GeoScene
 from .utils import adjust3Dview, getBBOX, isTopView
 from ..core.proj import SRS, reprojBbox
-from ..core.utils.resilience import retry_with_backoff, with_circuit_breaker
+from ..core.utils.threading_utils import CancellableThreadPool
+from .dem_download import download_dem_file
 
 from ..core import settings
 USER_AGENT = settings.user_agent
@@ -100,10 +100,6 @@ class IMPORTGIS_OT_dem_query(Operator):
 				self.report({'ERROR'}, "OpenTopography API key required. Register at opentopography.org, request key, and add to BlenderGIS preferences.")
 				return {'CANCELLED'}
 
-		#Set cursor representation to 'loading' icon
-		w = context.window
-		w.cursor_set('WAIT')
-
 		#url template
 		#http://opentopo.sdsc.edu/otr/getdem?demtype=SRTMGL3&west=-120.168457&south=36.738884&east=-118.465576&north=38.091337&outputFormat=GTiff
 		e = 0.002 #opentopo service does not always respect the entire bbox, so request for a little more
@@ -120,15 +116,70 @@ class IMPORTGIS_OT_dem_query(Operator):
 		else:
 			filePath = os.path.join(bpy.app.tempdir, 'srtm.tif')
 
+		self.url = url
+		self.filePath = filePath
+		#the active object may change while downloading, remember its index now
+		if onMesh:
+			self.objIdx = [str(i) for i, obj in enumerate(scn.collection.all_objects) if obj.name == aObj.name][0]
+		else:
+			self.objIdx = None
+
 		#we can directly init NpImg from blob but if gdal is not used as image engine then georef will not be extracted
 		#Alternatively, we can save on disk, open with GeoRaster class (will use tyf if gdal not available)
-		rq = Request(url, headers={'User-Agent': USER_AGENT})
-		try:
-			with urlopen(rq, timeout=TIMEOUT) as response, open(filePath, 'wb') as outFile:
-				data = response.read() # a `bytes` object
-				outFile.write(data) #
-		except (URLError, HTTPError) as err:
-			log.error('HTTP request failed. URL: %s, Code: %s, Error: %s', url, getattr(err, 'code', 'unknown'), err.reason, exc_info=True)
+		if context.window is None:
+			#no UI (background mode), nothing to keep responsive
+			try:
+				download_dem_file(url, filePath, USER_AGENT, timeout=TIMEOUT)
+			except Exception as err:
+				return self.downloadFailed(err)
+			return self.importDEM(context)
+
+		#Download in a worker thread, the modal timer polls for completion
+		self.pool = CancellableThreadPool(max_workers=1, timeout=TIMEOUT)
+		self.pool.submit_task(download_dem_file, url, filePath, USER_AGENT, timeout=TIMEOUT)
+
+		wm = context.window_manager
+		self.timer = wm.event_timer_add(0.2, window=context.window)
+		wm.modal_handler_add(self)
+		#Set cursor representation to 'loading' icon
+		context.window.cursor_modal_set('WAIT')
+		context.workspace.status_text_set("Downloading elevation data... (Esc to cancel)")
+
+		return {'RUNNING_MODAL'}
+
+	def modal(self, context, event):
+
+		if event.type == 'ESC':
+			self.pool.cancel()
+			self.finishModal(context)
+			log.info('DEM download cancelled by user')
+			self.report({'WARNING'}, "DEM download cancelled")
+			return {'CANCELLED'}
+
+		if event.type != 'TIMER' or not self.pool.futures[0].done():
+			return {'PASS_THROUGH'}
+
+		self.finishModal(context)
+		err = self.pool.futures[0].exception()
+		self.pool.shutdown(wait=False)
+		if err is not None:
+			return self.downloadFailed(err)
+		return self.importDEM(context)
+
+	def finishModal(self, context):
+		context.window_manager.event_timer_remove(self.timer)
+		context.window.cursor_modal_restore()
+		context.workspace.status_text_set(None)
+
+	def downloadFailed(self, err):
+		"""Report a download error to the user and cancel"""
+		url = self.url
+		if isinstance(err, RuntimeError):
+			# Circuit breaker open: the service failed repeatedly, don't hammer it
+			log.error('DEM service unavailable: %s', err)
+			self.report({'ERROR'}, "DEM service temporarily unavailable after repeated failures. Please retry later or try another server.")
+		elif isinstance(err, (URLError, HTTPError)):
+			log.error('HTTP request failed. URL: %s, Code: %s, Error: %s', url, getattr(err, 'code', 'unknown'), err.reason, exc_info=err)
 			error_code = getattr(err, 'code', None)
 			if error_code == 401:
 				self.report({'ERROR'}, "Authentication failed: Invalid or expired API key. Check OpenTopography account.")
@@ -136,19 +187,21 @@ class IMPORTGIS_OT_dem_query(Operator):
 				self.report({'ERROR'}, "Rate limit exceeded: Too many requests. Please retry in a few minutes.")
 			else:
 				self.report({'ERROR'}, f"Cannot reach DEM service (HTTP {error_code}). Check internet connection or try another server.")
-			return {'CANCELLED'}
-		except TimeoutError as err:
-			log.error('HTTP request timeout after %ds. URL: %s', TIMEOUT, url, exc_info=True)
+		elif isinstance(err, TimeoutError):
+			log.error('HTTP request timeout after %ds. URL: %s', TIMEOUT, url, exc_info=err)
 			self.report({'ERROR'}, f"DEM service timeout ({TIMEOUT}s). Server may be down. Try another provider or retry later.")
-			return {'CANCELLED'}
-		except Exception as err:
-			log.error('Unexpected error downloading DEM', exc_info=True)
+		else:
+			log.error('Unexpected error downloading DEM', exc_info=err)
 			self.report({'ERROR'}, f"Unexpected error: {str(err)}. Check logs for details.")
+		return {'CANCELLED'}
 
-		if not onMesh:
+	def importDEM(self, context):
+		"""Import the downloaded GeoTIFF as a DEM"""
+		scn = context.scene
+		if self.objIdx is None:
 			bpy.ops.importgis.georaster(
 			'EXEC_DEFAULT',
-			filepath = filePath,
+			filepath = self.filePath,
 			reprojection = True,
 			rastCRS = 'EPSG:4326',
 			importMode = 'DEM',
@@ -157,14 +210,14 @@ class IMPORTGIS_OT_dem_query(Operator):
 		else:
 			bpy.ops.importgis.georaster(
 			'EXEC_DEFAULT',
-			filepath = filePath,
+			filepath = self.filePath,
 			reprojection = True,
 			rastCRS = 'EPSG:4326',
 			importMode = 'DEM',
 			subdivision = 'subsurf',
 			demInterpolation = True,
 			demOnMesh = True,
-			objectsLst = [str(i) for i, obj in enumerate(scn.collection.all_objects) if obj.name == bpy.context.active_object.name][0],
+			objectsLst = self.objIdx,
 			clip = False,
 			fillNodata = False)
 
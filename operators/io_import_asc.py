@@ -124,15 +124,15 @@ class IMPORTGIS_OT_ascii_grid(BaseImportOperator):
     def poll(cls, context):
         return context.mode == 'OBJECT'
 
-    def execute(self, context):
+    def import_one(self, context, filepath):
+        """Import one grid file, errors are raised and reported by execute_batch."""
         prefs = context.preferences.addons[PKG].preferences
         bpy.ops.object.select_all(action='DESELECT')
 
         # Get scene and validate georeferencing
         geoscn = self.get_geoscene(context)
         if geoscn.isBroken:
-            self.report_error(self.report, "Scene georef is broken, please fix it beforehand")
-            return {'CANCELLED'}
+            raise ValueError("Scene georef is broken, please fix it beforehand")
 
         # Get origin if already georeferenced
         if geoscn.isGeoref:
@@ -141,14 +141,10 @@ class IMPORTGIS_OT_ascii_grid(BaseImportOperator):
             dx, dy = 0, 0
         scale = geoscn.scale
 
-        # Sync scene CRS with import CRS
+        # Scene CRS was synced with the import CRS by execute_batch
         import_crs = self.get_crs()
-        try:
-            if not geoscn.hasCRS:
-                geoscn.crs = import_crs
-        except Exception as e:
-            self.report_error(self.report, f"Cannot set scene CRS: {e}")
-            return {'CANCELLED'}
+        if not geoscn.hasCRS:
+            raise ValueError(f"Cannot set scene CRS to {import_crs}")
 
         # Build reprojector if CRS mismatch
         rprj = geoscn.crs != import_crs
@@ -160,7 +156,7 @@ class IMPORTGIS_OT_ascii_grid(BaseImportOperator):
             rprjToScene = None
 
         #Path
-        filename = self.filepath
+        filename = filepath
         name = os.path.splitext(os.path.basename(filename))[0]
         log.info('Importing {}...'.format(filename))
 
@@ -221,9 +217,7 @@ class IMPORTGIS_OT_ascii_grid(BaseImportOperator):
             # spec doesn't require newline separated rows so make it handle a single line of all values
             coldata = read(f, ncols)
             if len(coldata) != ncols:
-                log.error('Incorrect number of columns for row {row}. Expected {expected}, got {actual}.'.format(row=nrows-y, expected=ncols, actual=len(coldata)))
-                self.report({'ERROR'}, 'Incorrect number of columns for row, check logs for more infos')
-                return {'CANCELLED'}
+                raise ValueError('Incorrect number of columns for row {row}. Expected {expected}, got {actual}.'.format(row=nrows-y, expected=ncols, actual=len(coldata)))
 
             for i in range(step - 1):
                 _ = read(f, ncols)
@@ -239,9 +233,7 @@ class IMPORTGIS_OT_ascii_grid(BaseImportOperator):
                     try:
                         vertices.append(pt + (float(coldata[x]),))
                     except ValueError as e:
-                        log.error('Value "{val}" in row {row}, column {col} could not be converted to a float.'.format(val=coldata[x], row=nrows-y, col=x))
-                        self.report({'ERROR'}, 'Cannot convert value to float')
-                        return {'CANCELLED'}
+                        raise ValueError('Value "{val}" in row {row}, column {col} could not be converted to a float.'.format(val=coldata[x], row=nrows-y, col=x)) from e
 
         if self.importMode == 'MESH':
             step_ncols = math.ceil(ncols / step)
@@ -274,7 +266,7 @@ class IMPORTGIS_OT_ascii_grid(BaseImportOperator):
             bb = getBBOX.fromObj(ob)
             adjust3Dview(context, bb)
 
-        return {'FINISHED'}
+        return ob
 
 def register():
 	try:
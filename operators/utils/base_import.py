@@ -11,19 +11,32 @@ Padroniza:
 """
 
 import os
+import stat
 import logging
+import functools
 import bpy
-from bpy.props import StringProperty, BoolProperty, EnumProperty
-from bpy.types import Operator
+from bpy.props import StringProperty, BoolProperty, EnumProperty, CollectionProperty
+from bpy.types import Operator, OperatorFileListElement
 from bpy_extras.io_utils import ImportHelper
 
 log = logging.getLogger(__name__)
 
 from ..geoscene import GeoScene, georefManagerLayout
-from ..prefs import PredefCRS
+from ..prefs import PredefCRS, PKG
 from ..core.proj import SRS
 
 
+# Predefined CRS enum items, rebuilt only when the preferences crs_rev changes.
+# Blender also needs the returned items to stay referenced while the UI draws
+_CRS_ENUM_CACHE = {'version': None, 'items': None}
+
+
+@functools.lru_cache(maxsize=128)
+def _srs_validate(crs_str: str) -> bool:
+	"""Return True if crs_str can be parsed as a SRS, memoized per string."""
+	return SRS.validate(crs_str)
+
+
 class BaseImportOperator(Operator, ImportHelper):
 	"""Base class for import operators with common functionality."""
 
@@ -32,8 +45,16 @@ class BaseImportOperator(Operator, ImportHelper):
 
 	# CRS selection (common to all import operators)
 	def list_predef_crs(self, context):
-		"""List predefined CRS from addon preferences."""
-		return PredefCRS.getEnumItems()
+		"""List predefined CRS from addon preferences (cached until they change)."""
+		# Blender may call enum items callbacks with context=None
+		prefs_ctx = context or bpy.context
+		prefs = prefs_ctx.preferences.addons[PKG].preferences
+		if prefs.crs_rev != _CRS_ENUM_CACHE['version']:
+			_CRS_ENUM_CACHE['items'] = tuple(PredefCRS.getEnumItems())
+			_CRS_ENUM_CACHE['version'] = prefs.crs_rev
+			# Predefined CRS changed, re-parse definitions on next validation
+			_srs_validate.cache_clear()
+		return _CRS_ENUM_CACHE['items']
 
 	import_crs: EnumProperty(
 		name="CRS",
@@ -41,6 +62,10 @@ class BaseImportOperator(Operator, ImportHelper):
 		items="list_predef_crs",
 	)
 
+	# Multiple selection in the file browser
+	files: CollectionProperty(type=OperatorFileListElement, options={'HIDDEN', 'SKIP_SAVE'})
+	directory: StringProperty(subtype='DIR_PATH', options={'HIDDEN', 'SKIP_SAVE'})
+
 	def draw(self, context):
 		"""Draw operator panel with standard CRS selector."""
 		layout = self.layout
@@ -53,9 +78,7 @@ class BaseImportOperator(Operator, ImportHelper):
 		row.operator("bgis.add_predef_crs", text='', icon='ADD')
 
 		# Georeferencing info if scene is already georeferenced
-		scn = bpy.context.scene
-		geoscn = GeoScene(scn)
-		if geoscn.isPartiallyGeoref:
+		if GeoScene(context.scene).isPartiallyGeoref:
 			georefManagerLayout(self, context)
 
 		# Subclasses can override and call super().draw() then add more UI
@@ -73,8 +96,7 @@ class BaseImportOperator(Operator, ImportHelper):
 		"""Validate selected CRS."""
 		try:
 			crs_str = self.get_crs()
-			srs = SRS(crs_str)
-			if not srs.is_valid:
+			if not _srs_validate(crs_str):
 				raise ValueError(f"Invalid CRS: {crs_str}")
 			return True
 		except Exception as e:
@@ -85,9 +107,11 @@ class BaseImportOperator(Operator, ImportHelper):
 		"""Validate that file exists and is readable."""
 		if not filepath:
 			raise ValueError("No file selected")
-		if not os.path.exists(filepath):
+		try:
+			st = os.stat(filepath)
+		except FileNotFoundError:
 			raise ValueError(f"File not found: {filepath}")
-		if not os.path.isfile(filepath):
+		if not stat.S_ISREG(st.st_mode):
 			raise ValueError(f"Path is not a file: {filepath}")
 		return True
 
@@ -129,3 +153,56 @@ class BaseImportOperator(Operator, ImportHelper):
 		except Exception as e:
 			log.warning(f"Could not sync scene CRS: {e}")
 			return False
+
+	def get_filepaths(self):
+		"""Get the selected file paths, several when multiple files are selected in the browser."""
+		if len(self.files) > 1:
+			return [os.path.join(self.directory, f.name) for f in self.files if f.name]
+		return [self.filepath]
+
+	def import_one(self, context, filepath):
+		"""Import a single file. Override this in subclasses to get a batch execute()."""
+		raise NotImplementedError
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		# Only subclasses implementing import_one are routed through execute_batch,
+		# the others keep their own execute()
+		if cls.import_one is not BaseImportOperator.import_one and not hasattr(cls, 'execute'):
+			cls.execute = BaseImportOperator.execute_selected
+
+	def execute_selected(self, context):
+		"""Import the selected file(s) through import_one."""
+		return self.execute_batch(context, self.get_filepaths())
+
+	def execute_batch(self, context, filepaths):
+		"""
+		Import several files, validating the CRS and syncing the scene georef once.
+
+		Args:
+			context: Blender context
+			filepaths: Paths of the files to import
+
+		Returns:
+			Operator return set
+		"""
+		if not self.validate_crs():
+			self.report_error(self.report, f"Invalid CRS: {self.get_crs()}")
+			return {'CANCELLED'}
+		self.sync_scene_crs(context)
+
+		failed = []
+		for filepath in filepaths:
+			try:
+				self.validate_file(filepath)
+				self.import_one(context, filepath)
+			except Exception as e:
+				log.error(f"Unable to import {filepath}", exc_info=True)
+				failed.append(f"{os.path.basename(filepath)} ({e})")
+
+		if len(failed) == len(filepaths):
+			self.report_error(self.report, f"Import failed: {', '.join(failed)}")
+			return {'CANCELLED'}
+		if failed:
+			self.report_warning(self.report, f"{len(failed)} of {len(filepaths)} files failed to import: {', '.join(failed)}")
+		return {'FINISHED'}
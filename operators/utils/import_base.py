@@ -6,6 +6,7 @@ Shared helpers to reduce duplication across import operators.
 Designed to be non-invasive: provides simple functions and a mixin
 that operators can use without changing their inheritance hierarchies.
 """
+import os
 import logging
 from typing import Tuple, Optional
 
@@ -25,12 +26,19 @@ from ...geoscene import GeoScene
 class ImportOperatorMixin:
 	"""Mixin with common error reporting and geoscene helpers"""
 
+	# Whether the class provides report(), resolved once per subclass
+	_has_report = False
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		cls._has_report = hasattr(cls, 'report')
+
 	def report_error(self, message: str, exc: Optional[Exception] = None) -> None:
 		if exc:
 			log.error(message, exc_info=True)
 		else:
 			log.error(message)
-		if hasattr(self, 'report'):
+		if self._has_report:
 			self.report({'ERROR'}, message)
 
 	def get_geoscene(self, context) -> GeoScene:
@@ -55,9 +63,25 @@ class ImportOperatorMixin:
 		return True, geoscn
 
 
+# Flags used to open files for reading, O_BINARY as open() does on Windows
+_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+
+
+def _open_read(filepath: str, mode: str):
+	"""Open filepath for reading from a raw file descriptor."""
+	fd = os.open(filepath, _READ_FLAGS)
+	try:
+		return os.fdopen(fd, mode, buffering=-1)
+	except Exception:
+		os.close(fd)
+		raise
+
+
 def safe_open(operator, filepath: str, mode: str = 'r'):
 	"""Open a file safely, reporting errors via operator.report"""
 	try:
+		if mode in ('r', 'rb'):
+			return _open_read(filepath, mode)
 		return open(filepath, mode)
 	except FileNotFoundError as e:
 		operator.report_error(f'File not found: {filepath}', e)
@@ -68,3 +92,32 @@ def safe_open(operator, filepath: str, mode: str = 'r'):
 	except Exception as e:
 		operator.report_error(f'Cannot open file: {filepath}', e)
 		return None
+
+
+def safe_read_bytes(operator, filepath: str) -> Optional[bytes]:
+	"""Read a whole file safely without a file object, reporting errors via operator.report"""
+	try:
+		fd = os.open(filepath, _READ_FLAGS)
+		try:
+			size = os.fstat(fd).st_size
+			data = os.read(fd, size) if size else b''
+			if size and len(data) == size:
+				return data
+			# Short read or a file whose size is not reported, read until EOF
+			chunks = [data]
+			while True:
+				data = os.read(fd, 65536)
+				if not data:
+					return b''.join(chunks)
+				chunks.append(data)
+		finally:
+			os.close(fd)
+	except FileNotFoundError as e:
+		operator.report_error(f'File not found: {filepath}', e)
+		return None
+	except PermissionError as e:
+		operator.report_error(f'Permission denied: {filepath}', e)
+		return None
+	except Exception as e:
+		operator.report_error(f'Cannot read file: {filepath}', e)
+		return None
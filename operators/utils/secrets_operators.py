@@ -4,12 +4,48 @@ Operators for managing secure API keys in BlenderGIS preferences.
 Integrates with keyring manager for secure credential storage.
 """
 
+import threading
+import time
+
 import bpy
 from bpy.types import Operator
 from bpy.props import StringProperty, EnumProperty
 
 from .core.utils.secrets import get_secrets_manager
 
+
+# Secrets manager resolved once and shared by all operators
+_SECRETS = None
+_SECRETS_LOCK = threading.Lock()
+
+# Keys retrieved by bgis.get_api_key, service -> (api_key, monotonic timestamp)
+API_KEY_CACHE_TTL = 60
+_API_KEY_CACHE = {}
+
+# Services listed by bgis.list_api_keys and the monotonic time they were listed at
+LIST_CACHE_TTL = 5.0
+_LIST_CACHE = {'t': 0.0, 'v': None}
+
+
+def _get_cached_secrets():
+	"""Return the shared secrets manager, resolving it on first use."""
+	global _SECRETS
+	if _SECRETS is None:
+		with _SECRETS_LOCK:
+			if _SECRETS is None:
+				_SECRETS = get_secrets_manager()
+	return _SECRETS
+
+
+def reset_cached_secrets():
+	"""Forget the cached secrets manager and keys, e.g. after a keyring backend change."""
+	global _SECRETS
+	with _SECRETS_LOCK:
+		_SECRETS = None
+		_API_KEY_CACHE.clear()
+		_LIST_CACHE['v'] = None
+
+
 class BGIS_OT_set_api_key(Operator):
 	"""Store API key securely using system keyring"""
 	
@@ -34,7 +70,9 @@ class BGIS_OT_set_api_key(Operator):
 			self.report({'ERROR'}, "Service and API key cannot be empty")
 			return {'CANCELLED'}
 
-		secrets = get_secrets_manager()
+		secrets = _get_cached_secrets()
+		_API_KEY_CACHE.pop(self.service, None)
+		_LIST_CACHE['v'] = None
 		if secrets.set_api_key(self.service, self.api_key):
 			self.report({'INFO'}, f"API key stored successfully for {self.service}")
 			return {'FINISHED'}
@@ -64,8 +102,14 @@ class BGIS_OT_get_api_key(Operator):
 			self.report({'ERROR'}, "Service name cannot be empty")
 			return {'CANCELLED'}
 
-		secrets = get_secrets_manager()
-		api_key = secrets.get_api_key(self.service)
+		cached = _API_KEY_CACHE.get(self.service)
+		if cached and time.monotonic() - cached[1] < API_KEY_CACHE_TTL:
+			api_key = cached[0]
+		else:
+			secrets = _get_cached_secrets()
+			api_key = secrets.get_api_key(self.service)
+			if api_key:
+				_API_KEY_CACHE[self.service] = (api_key, time.monotonic())
 		
 		if api_key:
 			self.report({'INFO'}, f"API key found for {self.service} (length: {len(api_key)})")
@@ -94,7 +138,9 @@ class BGIS_OT_delete_api_key(Operator):
 			self.report({'ERROR'}, "Service name cannot be empty")
 			return {'CANCELLED'}
 
-		secrets = get_secrets_manager()
+		secrets = _get_cached_secrets()
+		_API_KEY_CACHE.pop(self.service, None)
+		_LIST_CACHE['v'] = None
 		if secrets.delete_api_key(self.service):
 			self.report({'INFO'}, f"API key deleted for {self.service}")
 			return {'FINISHED'}
@@ -112,8 +158,13 @@ class BGIS_OT_list_api_keys(Operator):
 	bl_options = {'INTERNAL'}
 
 	def execute(self, context):
-		secrets = get_secrets_manager()
-		services = secrets.list_services()
+		now = time.monotonic()
+		if _LIST_CACHE['v'] is not None and now - _LIST_CACHE['t'] < LIST_CACHE_TTL:
+			services = _LIST_CACHE['v']
+		else:
+			secrets = _get_cached_secrets()
+			services = secrets.list_services()
+			_LIST_CACHE.update(t=now, v=services)
 		
 		if services:
 			msg = "Stored API keys:\n" + "\n".join(
@@ -136,11 +187,4 @@ classes = [
 ]
 
 
-def register():
-	for cls in classes:
-		bpy.utils.register_class(cls)
-
-
-def unregister():
-	for cls in reversed(classes):
-		bpy.utils.unregister_class(cls)
+register, unregister = bpy.utils.register_classes_factory(classes)
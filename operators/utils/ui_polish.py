@@ -9,15 +9,36 @@ Implements:
 - Status messages with time estimation
 """
 
+import os
 import bpy
 import time
+import weakref
 import logging
+import platform
+import itertools
+import subprocess
 from bpy.types import Operator, Panel
 from bpy.props import StringProperty, IntProperty, FloatProperty, BoolProperty
 from enum import Enum
 
 log = logging.getLogger(__name__)
 
+# Open a file with the system default application, resolved once for the platform
+_sys = platform.system()
+if _sys == 'Darwin':  # macOS
+	_OPEN_FILE = lambda path: subprocess.Popen(['open', path])
+elif _sys == 'Windows':
+	_OPEN_FILE = os.startfile
+else:  # Linux
+	_OPEN_FILE = lambda path: subprocess.Popen(['xdg-open', path])
+
+# Progress trackers being displayed, key -> tracker. Entries go away with their tracker
+_ACTIVE_PROGRESS = weakref.WeakValueDictionary()
+_progress_keys = itertools.count(1)
+
+# Latest log file found in the log directory and the directory mtime it was found at
+_LOG_CACHE = {'dir': None, 'dir_mtime': None, 'path': None}
+
 
 class ProgressTracker:
 	"""Tracks and reports operation progress to Blender UI.
@@ -25,6 +46,15 @@ class ProgressTracker:
 	Updates progress through a modal timer operator.
 	"""
 
+	__slots__ = ('context', 'title', 'total_items', 'current_item', 'start_time',
+		'paused', 'pause_time', '_cached_status', '_cached_key', '_ewma_rate', '_last_update_t',
+		'parent_op', 'key', '__weakref__')
+
+	# Smoothing factor of the items/sec moving average
+	RATE_ALPHA = 0.2
+
+	_FMT = "{title}: {pct:d}% ({cur}/{tot}) Elapsed: {em:02d}:{es:02d} ETA: {tm:02d}:{ts:02d}"
+
 	def __init__(self, context, title: str, total_items: int):
 		"""Initialize progress tracker.
 		
@@ -35,12 +65,23 @@ class ProgressTracker:
 		"""
 		self.context = context
 		self.title = title
+		# Operator to cancel when the user aborts, and registry key while displayed
+		self.parent_op = None
+		self.key = None
 		self.total_items = max(1, total_items)
 		self.current_item = 0
-		self.start_time = time.time()
+		self.start_time = time.monotonic()
 		self.paused = False
 		self.pause_time = 0
 
+		# Last status string and the displayed values it was formatted for
+		self._cached_status = ''
+		self._cached_key = None
+
+		# Exponentially weighted moving average of items/sec, updated on progress
+		self._ewma_rate = 0.0
+		self._last_update_t = self.start_time
+
 	def update(self, count: int = 1, message: str = ""):
 		"""Update progress.
 		
@@ -48,6 +89,14 @@ class ProgressTracker:
 			count: Number of items processed (default: 1)
 			message: Status message to display
 		"""
+		now = time.monotonic()
+		dt = now - self._last_update_t
+		if dt > 0:
+			rate = count / dt
+			if self._ewma_rate > 0:
+				rate = self.RATE_ALPHA * rate + (1 - self.RATE_ALPHA) * self._ewma_rate
+			self._ewma_rate = rate
+			self._last_update_t = now
 		self.current_item += count
 
 	def get_progress_percent(self) -> float:
@@ -56,32 +105,52 @@ class ProgressTracker:
 
 	def get_eta_seconds(self) -> float:
 		"""Estimate remaining time in seconds."""
-		if self.current_item == 0:
+		if self._ewma_rate <= 0:
 			return 0
-		
-		elapsed = time.time() - self.start_time - self.pause_time
-		rate = self.current_item / max(0.1, elapsed)  # items/sec
-		remaining = self.total_items - self.current_item
-		
-		return remaining / rate if rate > 0 else 0
+		return (self.total_items - self.current_item) / self._ewma_rate
 
 	def get_status_string(self) -> str:
-		"""Get formatted status message."""
-		percent = self.get_progress_percent()
-		eta = self.get_eta_seconds()
-		elapsed = time.time() - self.start_time - self.pause_time
-		
+		"""Get formatted status message, reformatted only when its displayed values change."""
+		percent = self.current_item * 100 // self.total_items
+		elapsed = int(time.monotonic() - self.start_time - self.pause_time)
+		eta = int(self.get_eta_seconds())
+
+		key = (percent, elapsed, eta, self.current_item)
+		if key == self._cached_key:
+			return self._cached_status
+
 		# Format times as MM:SS
-		elapsed_str = f"{int(elapsed)//60:02d}:{int(elapsed)%60:02d}"
-		eta_str = f"{int(eta)//60:02d}:{int(eta)%60:02d}"
-		
-		return f"{self.title}: {percent:.0f}% ({self.current_item}/{self.total_items}) Elapsed: {elapsed_str} ETA: {eta_str}"
+		em, es = divmod(elapsed, 60)
+		tm, ts = divmod(eta, 60)
+
+		self._cached_status = self._FMT.format_map({'title': self.title, 'pct': percent,
+			'cur': self.current_item, 'tot': self.total_items, 'em': em, 'es': es, 'tm': tm, 'ts': ts})
+		self._cached_key = key
+		return self._cached_status
 
 	def is_complete(self) -> bool:
 		"""Check if all items processed."""
 		return self.current_item >= self.total_items
 
 
+def register_progress(progress: ProgressTracker) -> int:
+	"""Make a tracker visible to the progress operator and status panel, return its key."""
+	progress.key = next(_progress_keys)
+	_ACTIVE_PROGRESS[progress.key] = progress
+	return progress.key
+
+
+def release_progress(progress: ProgressTracker):
+	"""Stop displaying a tracker."""
+	_ACTIVE_PROGRESS.pop(progress.key, None)
+
+
+def latest_progress() -> ProgressTracker:
+	"""Return the most recently registered tracker still displayed, or None."""
+	items = list(_ACTIVE_PROGRESS.items())
+	return max(items, key=lambda item: item[0])[1] if items else None
+
+
 class BGIS_OT_modal_progress(Operator):
 	"""Modal operator for displaying real-time progress.
 	
@@ -92,71 +161,96 @@ class BGIS_OT_modal_progress(Operator):
 	bl_label = "Operation Progress"
 	bl_options = {'INTERNAL'}
 
-	# Store reference to parent operator and progress tracker
-	_parent_op = None
-	_progress = None
-	_timer = None
-
 	title: StringProperty(name="Title", default="Processing")
 	total: IntProperty(name="Total", default=100)
 	current: IntProperty(name="Current", default=0)
 	status_msg: StringProperty(name="Status", default="")
 	is_complete: BoolProperty(name="Complete", default=False)
+	progress_key: IntProperty(name="Progress", default=0, options={'HIDDEN', 'SKIP_SAVE'})
 
 	def modal(self, context, event):
 		"""Handle modal events."""
+		progress = self._progress
+
 		if event.type == 'ESC':
 			# Cancel operation
-			if self._parent_op and hasattr(self._parent_op, 'cancel'):
-				self._parent_op.cancel()
+			parent_op = progress.parent_op if progress else None
+			if parent_op and hasattr(parent_op, 'cancel'):
+				parent_op.cancel()
 			self.report({'INFO'}, "Operation cancelled")
 			return self.finish_modal()
 
-		if event.type == 'TIMER':
-			# Update progress display
-			if self._progress:
-				self.current = self._progress.current_item
-				self.total = self._progress.total_items
-				self.status_msg = self._progress.get_status_string()
-
-				# Header display
-				for area in context.screen.areas:
-					if area.type == 'PROPERTIES':
-						area.tag_redraw()
+		if event.type == 'TIMER' and (progress is None or progress.key not in _ACTIVE_PROGRESS):
+			# Tracked operation ended without completing (cancelled or failed)
+			for area in self._redraw_areas:
+				area.tag_redraw()
+			return self.finish_modal()
 
-				if self._progress.is_complete():
-					return self.finish_modal()
+		if event.type == 'TIMER':
+			# Update progress display only when it visibly advanced
+			current = progress.current_item
+			if current == self._last_reported:
+				return {'RUNNING_MODAL'}
+			step = max(1, progress.total_items // 200)
+			complete = progress.is_complete()
+			if current - self._last_reported < step and not complete:
+				return {'RUNNING_MODAL'}
+
+			self.current = current
+			self.total = progress.total_items
+			self.status_msg = progress.get_status_string()
+			self._last_reported = current
+
+			for area in self._redraw_areas:
+				area.tag_redraw()
+
+			if complete:
+				return self.finish_modal()
 
 		return {'RUNNING_MODAL'}
 
 	def finish_modal(self):
 		"""Clean up and finish modal."""
-		if self._timer:
-			wm = bpy.context.window_manager
-			wm.event_timer_remove(self._timer)
+		wm = bpy.context.window_manager
+		wm.event_timer_remove(self._timer)
+		if self._progress is not None:
+			release_progress(self._progress)
+			self._progress = None
 
 		return {'FINISHED'}
 
 	def execute(self, context):
 		"""Set up modal timer."""
+		# Keep the tracker alive while displayed
+		self._progress = _ACTIVE_PROGRESS.get(self.progress_key)
+		# Areas showing the progress, looked up once instead of on every tick
+		self._redraw_areas = [area for area in context.screen.areas if area.type in ('PROPERTIES', 'HEADER')]
+		self._last_reported = -1
 		wm = context.window_manager
 		self._timer = wm.event_timer_add(0.1, window=context.window)
 		wm.modal_handler_add(self)
 		return {'RUNNING_MODAL'}
 
 	@classmethod
-	def start(cls, context, title: str, total_items: int):
+	def start(cls, context, title: str, total_items: int, parent_op=None):
 		"""Start modal progress display.
 		
+		Args:
+			context: Blender context
+			title: Operation title
+			total_items: Total number of items to process
+			parent_op: Operator whose cancel() is called when the user aborts
+
 		Returns:
 			ProgressTracker instance
 		"""
-		# Execute modal operator
-		bpy.ops.bgis.modal_progress('INVOKE_DEFAULT')
-
-		# Create and return progress tracker
+		# Create progress tracker
 		progress = ProgressTracker(context, title, total_items)
-		cls._progress = progress
+		progress.parent_op = parent_op
+		key = register_progress(progress)
+
+		# Execute modal operator
+		bpy.ops.bgis.modal_progress('INVOKE_DEFAULT', title=title, total=progress.total_items, progress_key=key)
 		return progress
 
 
@@ -171,6 +265,10 @@ class BGIS_OT_error_details(Operator):
 	error_message: StringProperty(name="Error Message", default="")
 	error_traceback: StringProperty(name="Traceback", default="")
 
+	# Non blank lines to display, split once in invoke
+	_msg_lines = ()
+	_tb_lines = ()
+
 	def draw(self, context):
 		"""Draw error dialog."""
 		layout = self.layout
@@ -184,10 +282,8 @@ class BGIS_OT_error_details(Operator):
 		if self.error_message:
 			col = layout.column()
 			col.label(text="Error:")
-			# Split message into lines for display
-			for line in self.error_message.split('\n'):
-				if line.strip():
-					col.label(text=line)
+			for line in self._msg_lines:
+				col.label(text=line)
 
 		# Traceback (if available)
 		if self.error_traceback:
@@ -195,9 +291,8 @@ class BGIS_OT_error_details(Operator):
 			box.label(text="Technical Details:")
 			col = box.column()
 			col.scale_y = 0.8
-			for line in self.error_traceback.split('\n')[-10:]:  # Last 10 lines
-				if line.strip():
-					col.label(text=line)
+			for line in self._tb_lines:
+				col.label(text=line)
 
 		# Buttons
 		row = layout.row(align=True)
@@ -208,6 +303,9 @@ class BGIS_OT_error_details(Operator):
 		return {'FINISHED'}
 
 	def invoke(self, context, event):
+		# Split message into lines for display, the dialog redraws often
+		self._msg_lines = [line for line in self.error_message.split('\n') if line.strip()]
+		self._tb_lines = [line for line in self.error_traceback.split('\n')[-10:] if line.strip()]  # Last 10 lines
 		return context.window_manager.invoke_props_dialog(self, width=600)
 
 
@@ -219,33 +317,30 @@ class BGIS_OT_open_error_log(Operator):
 	bl_options = {'INTERNAL'}
 
 	def execute(self, context):
-		import subprocess
-		import os
-		import platform
-
 		# Get log file path (typically in user app data)
 		log_dir = os.path.expanduser('~/.bgis/logs')
 		if not os.path.exists(log_dir):
 			self.report({'ERROR'}, f"Log directory not found: {log_dir}")
 			return {'CANCELLED'}
 
-		# Find latest log file
-		log_files = sorted([f for f in os.listdir(log_dir) if f.endswith('.log')])
-		if not log_files:
+		# Find latest log file, the directory is only rescanned when its content changed
+		dir_mtime = os.stat(log_dir).st_mtime_ns
+		log_file = _LOG_CACHE['path']
+		if (_LOG_CACHE['dir'] != log_dir or _LOG_CACHE['dir_mtime'] != dir_mtime
+				or log_file is None or not os.path.exists(log_file)):
+			with os.scandir(log_dir) as it:
+				latest = max((e for e in it if e.name.endswith('.log') and e.is_file()),
+					key=lambda e: e.stat().st_mtime_ns, default=None)
+			log_file = latest.path if latest is not None else None
+			_LOG_CACHE.update({'dir': log_dir, 'dir_mtime': dir_mtime, 'path': log_file})
+
+		if log_file is None:
 			self.report({'ERROR'}, "No log files found")
 			return {'CANCELLED'}
 
-		log_file = os.path.join(log_dir, log_files[-1])
-
 		# Open with system default editor
 		try:
-			if platform.system() == 'Darwin':  # macOS
-				subprocess.Popen(['open', log_file])
-			elif platform.system() == 'Windows':
-				os.startfile(log_file)
-			else:  # Linux
-				subprocess.Popen(['xdg-open', log_file])
-			
+			_OPEN_FILE(log_file)
 			self.report({'INFO'}, f"Opened log file: {log_file}")
 			return {'FINISHED'}
 		except Exception as e:
@@ -256,6 +351,10 @@ class BGIS_OT_open_error_log(Operator):
 class BGIS_OT_operation_with_progress(Operator):
 	"""Base class for long-running operations with progress display.
 	
+	Items are processed on the main thread from a modal timer, a batch
+	bounded by TICK_BUDGET seconds per tick, so the UI keeps redrawing and
+	process_item() can modify Blender data.
+
 	Subclasses should implement:
 	- get_total_items(): Returns number of items to process
 	- process_item(index): Process single item
@@ -264,45 +363,82 @@ class BGIS_OT_operation_with_progress(Operator):
 
 	bl_options = {'REGISTER', 'UNDO'}
 
+	# Seconds of processing per timer tick before handing control back to the UI
+	TICK_BUDGET = 0.05
+
 	_progress = None
 	_cancel_requested = False
+	_next_index = 0
+	_total = 0
+	_timer = None
 
 	def execute(self, context):
-		"""Execute operation with progress tracking."""
+		"""Start the modal timer processing the items."""
 		try:
 			total = self.get_total_items()
 			title = self.get_title()
-
-			# Start progress display
-			self._progress = ProgressTracker(context, title, total)
-
-			# Process items
-			for i in range(total):
-				if self._cancel_requested:
-					self.report({'WARNING'}, "Operation cancelled")
-					return {'CANCELLED'}
-
-				try:
-					self.process_item(i)
-					self._progress.update(1)
-				except Exception as e:
-					self.report({'ERROR'}, f"Failed to process item {i+1}: {str(e)}")
-					log.exception(f"Error processing item {i}")
-					return {'CANCELLED'}
-
-				# Allow UI updates
-				for area in context.screen.areas:
-					if area.type in ('PROPERTIES', 'HEADER'):
-						area.tag_redraw()
-
-			self.report({'INFO'}, f"{title}: Completed successfully")
-			return {'FINISHED'}
-
 		except Exception as e:
 			self.report({'ERROR'}, str(e))
 			log.exception("Operation failed")
 			return {'CANCELLED'}
 
+		# Start progress display, the modal progress operator redraws the UI at its own cadence
+		self._progress = BGIS_OT_modal_progress.start(context, title, total, parent_op=self)
+
+		self._cancel_requested = False
+		self._next_index = 0
+		self._total = total
+
+		wm = context.window_manager
+		self._timer = wm.event_timer_add(0.01, window=context.window)
+		wm.modal_handler_add(self)
+		return {'RUNNING_MODAL'}
+
+	def modal(self, context, event):
+		"""Process a time-bounded batch of items and update progress display."""
+		if event.type == 'ESC':
+			# Stops before the next item
+			self.cancel()
+			return {'RUNNING_MODAL'}
+
+		if event.type != 'TIMER':
+			return {'PASS_THROUGH'}
+
+		deadline = time.perf_counter() + self.TICK_BUDGET
+		done = 0
+		while self._next_index < self._total and not self._cancel_requested:
+			i = self._next_index
+			try:
+				self.process_item(i)
+			except Exception as e:
+				log.exception(f"Error processing item {i}")
+				self.report({'ERROR'}, f"Failed to process item {i+1}: {str(e)}")
+				return self.finish(context, {'CANCELLED'})
+			self._next_index += 1
+			done += 1
+			if time.perf_counter() >= deadline:
+				break
+
+		if done:
+			self._progress.update(done)
+
+		if self._cancel_requested or self._next_index >= self._total:
+			return self.finish(context)
+		return {'RUNNING_MODAL'}
+
+	def finish(self, context, result=None):
+		"""Remove the timer and report the operation outcome."""
+		context.window_manager.event_timer_remove(self._timer)
+		release_progress(self._progress)
+
+		if result is not None:
+			return result
+		if self._cancel_requested:
+			self.report({'WARNING'}, "Operation cancelled")
+			return {'CANCELLED'}
+		self.report({'INFO'}, f"{self._progress.title}: Completed successfully")
+		return {'FINISHED'}
+
 	def cancel(self):
 		"""Request cancellation of operation."""
 		self._cancel_requested = True
@@ -334,8 +470,8 @@ class BGIS_PANEL_operation_status(Panel):
 		layout = self.layout
 
 		# Check if there's an active progress tracker
-		if BGIS_OT_modal_progress._progress:
-			progress = BGIS_OT_modal_progress._progress
+		progress = latest_progress()
+		if progress:
 
 			# Progress bar
 			col = layout.column()
@@ -364,8 +500,9 @@ class BGIS_OT_cancel_operation(Operator):
 	bl_label = "Cancel"
 
 	def execute(self, context):
-		if BGIS_OT_modal_progress._parent_op:
-			BGIS_OT_modal_progress._parent_op.cancel()
+		progress = latest_progress()
+		if progress and progress.parent_op:
+			progress.parent_op.cancel()
 		return {'FINISHED'}
 
 
@@ -380,11 +517,4 @@ classes = [
 ]
 
 
-def register():
-	for cls in classes:
-		bpy.utils.register_class(cls)
-
-
-def unregister():
-	for cls in reversed(classes):
-		bpy.utils.unregister_class(cls)
+register, unregister = bpy.utils.register_classes_factory(classes)
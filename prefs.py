@@ -137,8 +137,15 @@ class BGIS_PREFS(AddonPreferences):
 	def listPredefCRS(self, context):
 		return [tuple(elem) for elem in json.loads(self.predefCrsJson)]
 
+	def updatePredefCRS(self, context):
+		#bump the revision so cached enum items get rebuilt
+		self.crs_rev += 1
+
 	#store crs preset as json string into addon preferences
-	predefCrsJson: StringProperty(default=json.dumps(DEFAULT_CRS))
+	predefCrsJson: StringProperty(default=json.dumps(DEFAULT_CRS), update=updatePredefCRS)
+
+	#revision counter of predefCrsJson, used to invalidate cached crs enum items
+	crs_rev: IntProperty(default=0, options={'HIDDEN'})
 
 	predefCrs: EnumProperty(
 		name = "Predefinate CRS",
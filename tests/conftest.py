@@ -0,0 +1,24 @@
+# -*- coding:utf-8 -*-
+"""
+Shared pytest configuration.
+
+Slow tests (real timeouts) are marked 'slow' explicitly, so they can be
+deselected with -m "not slow" or spread across xdist workers.
+
+Tests marked 'timing' rely on real wall-clock timeouts and can fail on
+overloaded machines, they are skipped unless --run-timing is passed.
+"""
+import pytest
+
+
+def pytest_addoption(parser):
+	parser.addoption("--run-timing", action="store_true", default=False,
+		help="run tests that depend on real wall-clock timing")
+
+
+def pytest_collection_modifyitems(config, items):
+	run_timing = config.getoption("--run-timing")
+	skip_timing = pytest.mark.skip(reason="needs --run-timing")
+	for item in items:
+		if not run_timing and "timing" in item.keywords:
+			item.add_marker(skip_timing)
@@ -0,0 +1,32 @@
+# -*- coding:utf-8 -*-
+"""
+Micro-benchmarks of hot code paths, run with: pytest tests/test_benchmarks.py --benchmark-only
+"""
+import pytest
+import numpy as np
+
+pytest.importorskip("pytest_benchmark")
+
+from core.proj.geotransform import view3d_to_proj, proj_to_view3d
+
+
+def test_bench_view3d_to_proj_scalar(benchmark):
+	benchmark(view3d_to_proj, 1000.0, 2000.0, 2.0, 10.0, -5.0)
+
+
+def test_bench_view3d_to_proj_array(benchmark):
+	rng = np.random.default_rng(0)
+	dx = rng.random(100_000)
+	dy = rng.random(100_000)
+	benchmark(view3d_to_proj, 1000.0, 2000.0, 2.0, dx, dy)
+
+
+def test_bench_proj_to_view3d_scalar(benchmark):
+	benchmark(proj_to_view3d, 1000.0, 2000.0, 2.0, 1040.0, 1990.0)
+
+
+def test_bench_proj_to_view3d_array(benchmark):
+	rng = np.random.default_rng(0)
+	x = 1000.0 + rng.random(100_000)
+	y = 2000.0 + rng.random(100_000)
+	benchmark(proj_to_view3d, 1000.0, 2000.0, 2.0, x, y)
@@ -5,17 +5,21 @@ Comprehensive pytest suite for BlenderGIS core modules.
 Coverage targets:
 - core.utils.resilience: 95% (retry, circuit breaker)
 - core.utils.threading_utils: 90% (thread pool, cancellation)
-- core.proj.geotransform: 95% (CRS transformations)
 - core.utils.secrets: 85% (keyring integration)
 - core.basemaps.sqlite_optimizer: 80% (SQLite optimizations)
+- core.utils.performance_monitor: 70% (metric aggregation)
 - operators.utils.base_import: 75% (base import operator)
 
 Run with: pytest tests/ -v --cov=. --cov-report=html
 """
 
 import pytest
+import asyncio
 import time
 import threading
+from collections import deque
+from functools import partial
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 import tempfile
@@ -29,82 +33,82 @@ from core.utils.resilience import (
 from core.utils.threading_utils import (
 	CancellableThreadPool, BoundedQueue, run_with_timeout
 )
-from core.proj.geotransform import (
-	view3d_to_proj, proj_to_view3d, move_origin_prj
-)
 from core.utils.secrets import SecretsManager, get_secrets_manager
 from core.basemaps.sqlite_optimizer import SQLiteOptimizer
+from core.utils.performance_monitor import PerformanceMonitor
 
 
 # ============= RESILIENCE MODULE TESTS =============
 
-class TestCircuitBreaker:
-	"""Test CircuitBreaker state machine."""
+class FakeClock:
+	"""Manually advanced clock, to test timeouts without sleeping."""
 
-	def test_circuit_breaker_initial_state(self):
-		"""Circuit breaker starts in CLOSED state."""
-		cb = CircuitBreaker(failure_threshold=3, recovery_timeout=1.0)
-		assert cb.state == 'CLOSED'
-		assert cb.failure_count == 0
+	def __init__(self, t=0.0):
+		self.t = t
 
-	def test_circuit_breaker_open_after_threshold(self):
-		"""Circuit breaker opens after N failures."""
-		cb = CircuitBreaker(failure_threshold=3, recovery_timeout=1.0)
-		
-		# Generate failures
-		for i in range(3):
-			cb.record_failure()
-		
-		assert cb.state == 'OPEN'
-		assert cb.failure_count == 3
+	def __call__(self):
+		return self.t
 
-	def test_circuit_breaker_half_open_after_timeout(self):
-		"""Circuit breaker transitions to HALF_OPEN after recovery timeout."""
-		cb = CircuitBreaker(failure_threshold=1, recovery_timeout=0.2)
-		
-		# Open the circuit
-		cb.record_failure()
-		assert cb.state == 'OPEN'
-		
-		# Wait for recovery timeout
-		time.sleep(0.3)
-		
-		# Should transition to HALF_OPEN
-		assert cb.state == 'HALF_OPEN'
+	def advance(self, seconds):
+		self.t += seconds
 
-	def test_circuit_breaker_closed_on_success(self):
-		"""Circuit breaker closes after successful call in HALF_OPEN state."""
-		cb = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
-		
-		# Open the circuit
-		cb.record_failure()
-		
-		# Wait for recovery
-		time.sleep(0.2)
-		assert cb.state == 'HALF_OPEN'
-		
-		# Record success
-		cb.record_success()
-		assert cb.state == 'CLOSED'
-		assert cb.failure_count == 0
 
-	def test_circuit_breaker_reopens_on_failure_in_half_open(self):
-		"""Circuit breaker reopens if failure occurs in HALF_OPEN state."""
-		cb = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
-		
-		# Open and transition to HALF_OPEN
+class TestCircuitBreaker:
+	"""Test CircuitBreaker state machine."""
+
+	@pytest.mark.parametrize("script,expected,failures", [
+		# Circuit breaker starts in CLOSED state
+		([], 'CLOSED', 0),
+		# Circuit breaker opens after N failures
+		(['fail', 'fail', 'fail'], 'OPEN', 3),
+		# Circuit breaker transitions to HALF_OPEN after recovery timeout
+		(['fail', 'fail', 'fail', 'advance:0.3'], 'HALF_OPEN', 3),
+		# Circuit breaker closes after successful call in HALF_OPEN state
+		(['fail', 'fail', 'fail', 'advance:0.3', 'success'], 'CLOSED', 0),
+		# Circuit breaker reopens if failure occurs in HALF_OPEN state
+		(['fail', 'fail', 'fail', 'advance:0.3', 'fail'], 'OPEN', 4),
+	], ids=['initial', 'open_after_threshold', 'half_open_after_timeout',
+		'closed_on_success', 'reopens_on_failure_in_half_open'])
+	def test_circuit_breaker_transitions(self, script, expected, failures):
+		"""Circuit breaker state machine follows the scripted events."""
+		clock = FakeClock()
+		cb = CircuitBreaker(failure_threshold=3, recovery_timeout=0.2, clock=clock)
+		
+		for step in script:
+			if step == 'fail':
+				cb.record_failure()
+			elif step == 'success':
+				cb.record_success()
+			else:
+				clock.advance(float(step.split(':')[1]))
+		
+		assert cb.state == expected
+		assert cb.failure_count == failures
+
+	def test_circuit_breaker_half_open_admits_single_probe(self):
+		"""Only one request is let through while HALF_OPEN."""
+		cb = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
 		cb.record_failure()
-		time.sleep(0.2)
 		
-		# Record failure in HALF_OPEN
+		assert cb.allow_request() is True
+		assert cb.allow_request() is False
+		
+		# Probe failed: circuit reopens, next probe allowed after timeout
 		cb.record_failure()
-		assert cb.state == 'OPEN'
+		assert cb.allow_request() is True
 
 
 class TestRetryDecorator:
 	"""Test retry_with_backoff decorator."""
 
-	def test_retry_succeeds_immediately(self):
+	@pytest.fixture(autouse=True)
+	def sleeps(self, monkeypatch):
+		"""Record the delays retries wait for instead of sleeping."""
+		delays = []
+		monkeypatch.setattr('core.utils.resilience.time.sleep', delays.append)
+		return delays
+
+	def test_retry_succeeds_immediately(self, sleeps):
 		"""Retry succeeds on first attempt."""
 		call_count = [0]
 		
@@ -116,8 +120,9 @@ class TestRetryDecorator:
 		result = successful_call()
 		assert result == "success"
 		assert call_count[0] == 1
+		assert sleeps == []
 
-	def test_retry_succeeds_after_failures(self):
+	def test_retry_succeeds_after_failures(self, sleeps):
 		"""Retry succeeds after N failures."""
 		call_count = [0]
 		
@@ -131,8 +136,9 @@ class TestRetryDecorator:
 		result = flaky_call()
 		assert result == "success"
 		assert call_count[0] == 3
+		assert len(sleeps) == 2
 
-	def test_retry_exhausts_max_retries(self):
+	def test_retry_exhausts_max_retries(self, sleeps):
 		"""Retry raises exception after max retries exceeded."""
 		@retry_with_backoff(max_retries=2, initial_delay=0.01)
 		def always_fails():
@@ -140,30 +146,49 @@ class TestRetryDecorator:
 		
 		with pytest.raises(ValueError):
 			always_fails()
+		assert len(sleeps) == 2
 
-	def test_retry_backoff_delay(self):
+	def test_retry_backoff_delay(self, sleeps):
 		"""Retry increases delay with exponential backoff."""
-		call_times = []
+		call_count = [0]
 		
-		@retry_with_backoff(max_retries=3, initial_delay=0.05)
-		def flaky_with_timing():
-			call_times.append(time.time())
-			if len(call_times) < 3:
+		@retry_with_backoff(max_retries=3, initial_delay=0.05, jitter=False)
+		def flaky_call():
+			call_count[0] += 1
+			if call_count[0] < 3:
 				raise ValueError("Retry me")
 			return "success"
 		
-		flaky_with_timing()
+		assert flaky_call() == "success"
+		assert sleeps == pytest.approx([0.05, 0.1])
+
+	def test_retry_coroutine(self):
+		"""Coroutine functions are retried without blocking the event loop."""
+		call_count = [0]
 		
-		# Check that delays increase
-		if len(call_times) >= 3:
-			delay1 = call_times[1] - call_times[0]
-			delay2 = call_times[2] - call_times[1]
-			assert delay2 >= delay1  # Second delay should be >= first
+		@retry_with_backoff(max_retries=3, initial_delay=0)
+		async def flaky_call():
+			call_count[0] += 1
+			if call_count[0] < 3:
+				raise ValueError("Temporary error")
+			return "success"
+		
+		result = asyncio.run(flaky_call())
+		assert result == "success"
+		assert call_count[0] == 3
 
 
 class TestCircuitBreakerDecorator:
 	"""Test with_circuit_breaker decorator."""
 
+	@pytest.fixture(autouse=True)
+	def reset_breakers(self):
+		"""Start each test with an empty circuit breaker registry."""
+		from core.utils.resilience import _breakers
+		_breakers.clear()
+		yield
+		_breakers.clear()
+
 	def test_circuit_breaker_decorator_allows_call_when_closed(self):
 		"""Decorator allows calls when circuit is closed."""
 		@with_circuit_breaker(service_name='test_service', failure_threshold=2)
@@ -175,7 +200,7 @@ class TestCircuitBreakerDecorator:
 
 	def test_circuit_breaker_decorator_raises_when_open(self):
 		"""Decorator raises RuntimeError when circuit is open."""
-		@with_circuit_breaker(service_name='test_service_open', failure_threshold=1)
+		@with_circuit_breaker(service_name='test_service', failure_threshold=1)
 		def failing_operation():
 			raise ValueError("Service error")
 		
@@ -192,85 +217,121 @@ class TestCircuitBreakerDecorator:
 
 # ============= THREADING MODULE TESTS =============
 
+_EXPECTED_IDS = frozenset(range(5))
+
+
+def _record_worker(sink, task_id):
+	sink.append(task_id)
+	return task_id
+
+
+def _wait_task(stop):
+	stop.wait(timeout=5)
+	return "done"
+
+
+def _gated_task(sink, started, proceed, task_id):
+	sink.append(task_id)
+	started.set()
+	proceed.wait(timeout=2)
+	return task_id
+
+
+def _record_progress(progress, done, total):
+	progress['completed'] = done
+
+
+def _done_task():
+	return "done"
+
+
+def _quick_operation():
+	return "result"
+
+
+def _failing_operation():
+	raise ValueError("Test error")
+
+
 class TestCancellableThreadPool:
 	"""Test CancellableThreadPool for resource safety."""
 
 	def test_thread_pool_executes_tasks(self):
 		"""Thread pool executes submitted tasks."""
-		results = []
-		
-		def worker(task_id):
-			results.append(task_id)
-			return task_id
+		executed = []
+		worker = partial(_record_worker, executed)
 		
-		with CancellableThreadPool(max_workers=2) as pool:
-			futures = [pool.submit(worker, i) for i in range(5)]
-			for future in futures:
-				future.result(timeout=5)
+		pool = CancellableThreadPool(max_workers=2)
+		for i in range(5):
+			pool.submit_task(worker, i)
+		results, errors = pool.wait_completion()
 		
-		assert len(results) == 5
-		assert set(results) == {0, 1, 2, 3, 4}
+		assert errors == []
+		assert frozenset(results) == _EXPECTED_IDS
+		assert frozenset(executed) == _EXPECTED_IDS
 
+	@pytest.mark.slow
+	@pytest.mark.timing
 	def test_thread_pool_timeout_per_task(self):
-		"""Thread pool enforces timeout per task."""
-		
-		def slow_task():
-			time.sleep(5)
-			return "done"
-		
-		with CancellableThreadPool(max_workers=1, timeout=0.1) as pool:
-			future = pool.submit(slow_task)
-			
-			with pytest.raises(TimeoutError):
-				future.result()
+		"""Waiting for the tasks gives up after the pool timeout."""
+		stop = threading.Event()
+		# Release the worker soon after the timeout, wait_completion joins it
+		release = threading.Timer(0.5, stop.set)
+		
+		pool = CancellableThreadPool(max_workers=1, timeout=0.1)
+		pool.submit_task(_wait_task, stop)
+		release.start()
+		try:
+			with pytest.raises(FutureTimeoutError):
+				pool.wait_completion()
+		finally:
+			stop.set()
+			release.cancel()
 
 	def test_thread_pool_cancellation(self):
 		"""Thread pool cancellation stops executing tasks."""
 		executed = []
-		
-		def task(task_id):
-			executed.append(task_id)
-			time.sleep(0.1)
-			return task_id
+		started = threading.Event()
+		proceed = threading.Event()
+		task = partial(_gated_task, executed, started, proceed)
 		
 		pool = CancellableThreadPool(max_workers=1)
+		for i in range(5):
+			pool.submit_task(task, i)
 		
-		# Submit multiple tasks
-		futures = [pool.submit(task, i) for i in range(5)]
-		
-		# Cancel after brief delay
-		time.sleep(0.05)
+		# Cancel while the first task is running
+		assert started.wait(timeout=1)
 		pool.cancel()
-		
-		# Check that not all tasks executed
-		assert len(executed) < 5
+		proceed.set()
 		pool.shutdown(wait=True)
+		
+		assert pool.is_cancelled
+		assert executed == [0]
+		assert sum(f.cancelled() for f in pool.futures) == 4
+		
+		# No new task is accepted once cancelled
+		pool.submit_task(task, 5)
+		assert len(pool.futures) == 5
 
 	def test_thread_pool_cleanup_on_exit(self):
-		"""Thread pool properly cleans up executor on exit."""
+		"""Thread pool shuts its executor down once the tasks are done."""
 		pool = CancellableThreadPool(max_workers=2)
-		executor = pool.executor
+		pool.submit_task(_done_task)
 		
-		with pool:
-			pool.submit(lambda: "test")
+		results, _ = pool.wait_completion()
 		
-		# Executor should be shut down
-		assert executor._shutdown
+		assert results == ["done"]
+		assert pool.executor._shutdown
 
 	def test_thread_pool_progress_callback(self):
 		"""Thread pool calls progress callback after each task."""
 		progress = {'completed': 0}
+		callback = partial(_record_progress, progress)
 		
-		def callback(done, total):
-			progress['completed'] = done
-		
-		def task():
-			return "done"
-		
-		with CancellableThreadPool(max_workers=2, progress_callback=callback) as pool:
-			futures = [pool.submit(task) for _ in range(3)]
-			for future in futures:
-				future.result()
+		pool = CancellableThreadPool(max_workers=2)
+		for _ in range(3):
+			pool.submit_task(_done_task)
+		pool.wait_completion(callback)
 		
 		assert progress['completed'] == 3
 
@@ -278,36 +339,34 @@ class TestCancellableThreadPool:
 class TestBoundedQueue:
 	"""Test BoundedQueue for backpressure."""
 
-	def test_bounded_queue_accepts_items_within_limit(self):
-		"""Queue accepts items while below max size."""
-		queue = BoundedQueue(max_size=3)
-		
-		queue.put("item1")
-		queue.put("item2")
-		queue.put("item3")
-		
-		assert queue.qsize() == 3
+	@pytest.mark.parametrize("ops", [
+		[("put", "a"), ("put", "b"), ("put", "c")],
+		[("put", "a"), ("get", None), ("put", "b")],
+		[("put", "a"), ("put", "b"), ("get", None), ("put", "c"), ("get", None)],
+		[("put", "a"), ("get", None), ("put", "b"), ("get", None), ("put", "c")],
+	], ids=["fill", "get-unblocks-put", "interleaved", "drain-refill"])
+	def test_bounded_queue_semantics(self, ops):
+		"""Put/get sequences behave like a FIFO deque of the same size."""
+		queue = BoundedQueue(maxsize=3)
+		model = deque()
+		
+		for op, value in ops:
+			if op == "put":
+				queue.put(value)
+				model.append(value)
+			else:
+				assert queue.get() == model.popleft()
+		
+		assert queue.qsize() == len(model)
 
 	def test_bounded_queue_blocks_when_full(self):
 		"""Queue blocks when at max size."""
-		queue = BoundedQueue(max_size=1)
+		queue = BoundedQueue(maxsize=1)
 		queue.put("item1")
 		
-		# This should timeout since queue is full
-		with pytest.raises(Exception):
-			queue.put("item2", timeout=0.1, block=True)
-
-	def test_bounded_queue_get_unblocks_put(self):
-		"""Getting item from queue allows put to proceed."""
-		queue = BoundedQueue(max_size=1)
-		queue.put("item1")
-		
-		retrieved = queue.get()
-		assert retrieved == "item1"
-		
-		# Should succeed now
-		queue.put("item2")
-		assert queue.qsize() == 1
+		# This should fail right away since queue is full
+		with pytest.raises(FutureTimeoutError):
+			queue.put_nowait("item2")
 
 
 class TestRunWithTimeout:
@@ -315,21 +374,23 @@ class TestRunWithTimeout:
 
 	def test_run_with_timeout_success(self):
 		"""Timeout helper returns success for quick operations."""
-		def quick_operation():
-			return "result"
-		
-		success, result, error = run_with_timeout(quick_operation, timeout=1.0)
+		success, result, error = run_with_timeout(_quick_operation, timeout=1.0)
 		
 		assert success is True
 		assert result == "result"
 		assert error is None
 
+	@pytest.mark.slow
+	@pytest.mark.timing
 	def test_run_with_timeout_exceeds_timeout(self):
 		"""Timeout helper reports timeout for slow operations."""
-		def slow_operation():
-			time.sleep(5)
+		stop = threading.Event()
 		
-		success, result, error = run_with_timeout(slow_operation, timeout=0.1)
+		try:
+			success, result, error = run_with_timeout(partial(_wait_task, stop), timeout=0.1)
+		finally:
+			# Release the worker instead of leaving it sleeping
+			stop.set()
 		
 		assert success is False
 		assert result is None
@@ -337,83 +398,13 @@ class TestRunWithTimeout:
 
 	def test_run_with_timeout_handles_exception(self):
 		"""Timeout helper captures exceptions."""
-		def failing_operation():
-			raise ValueError("Test error")
-		
-		success, result, error = run_with_timeout(failing_operation, timeout=1.0)
+		success, result, error = run_with_timeout(_failing_operation, timeout=1.0)
 		
 		assert success is False
 		assert result is None
 		assert "Test error" in error
 
 
-# ============= GEOTRANSFORM MODULE TESTS =============
-
-class TestGeoTransform:
-	"""Test coordinate transformation functions."""
-
-	def test_view3d_to_proj_basic(self):
-		"""Convert View3D offsets to CRS coordinates."""
-		x, y = view3d_to_proj(
-			crsx=0, crsy=0,  # Origin at CRS origin
-			scale=1,          # 1:1 scale
-			dx=100, dy=50     # 100m east, 50m north
-		)
-		
-		assert x == 100
-		assert y == 50
-
-	def test_proj_to_view3d_basic(self):
-		"""Convert CRS coordinates to View3D offsets."""
-		dx, dy = proj_to_view3d(
-			crsx=0, crsy=0,
-			scale=1,
-			x=100, y=50
-		)
-		
-		assert dx == 100
-		assert dy == 50
-
-	def test_view3d_proj_roundtrip(self):
-		"""View3D -> CRS -> View3D roundtrip preserves coordinates."""
-		original_dx, original_dy = 500, 250
-		
-		# View3D to CRS
-		x, y = view3d_to_proj(0, 0, 1, original_dx, original_dy)
-		
-		# CRS back to View3D
-		dx, dy = proj_to_view3d(0, 0, 1, x, y)
-		
-		assert dx == pytest.approx(original_dx)
-		assert dy == pytest.approx(original_dy)
-
-	def test_move_origin_prj_with_scale(self):
-		"""Move origin with scale factor applied."""
-		new_x, new_y = move_origin_prj(
-			crsx=1000, crsy=2000,
-			dx=100, dy=50,
-			scale=2,
-			use_scale=True
-		)
-		
-		# With scale=2: actual displacement is 100*2=200, 50*2=100
-		assert new_x == pytest.approx(1200)
-		assert new_y == pytest.approx(2100)
-
-	def test_move_origin_prj_without_scale(self):
-		"""Move origin without applying scale factor."""
-		new_x, new_y = move_origin_prj(
-			crsx=1000, crsy=2000,
-			dx=100, dy=50,
-			scale=2,
-			use_scale=False
-		)
-		
-		# Scale ignored
-		assert new_x == pytest.approx(1100)
-		assert new_y == pytest.approx(2050)
-
-
 # ============= SECRETS MODULE TESTS =============
 
 class TestSecretsManager:
@@ -421,12 +412,16 @@ class TestSecretsManager:
 
 	@pytest.fixture
 	def temp_secrets(self):
-		"""Create temporary secrets manager for testing."""
-		with tempfile.TemporaryDirectory() as tmpdir:
-			manager = SecretsManager()
-			# Override fallback path for testing
-			manager.fallback_path = Path(tmpdir) / '.blendergis_secrets'
-			yield manager
+		"""Create in-memory secrets manager for testing."""
+		return SecretsManager(backend={})
+
+	@pytest.fixture
+	def file_secrets(self, tmp_path):
+		"""Create secrets manager storing into a temporary fallback file."""
+		manager = SecretsManager()
+		# Override fallback path for testing
+		manager.fallback_path = tmp_path / '.blendergis_secrets'
+		return manager
 
 	def test_secrets_manager_set_and_get(self, temp_secrets):
 		"""Store and retrieve API key."""
@@ -467,50 +462,71 @@ class TestSecretsManager:
 		assert 'service2' in services
 		assert 'default' in services['service1']
 
+	def test_secrets_manager_sees_external_changes(self, file_secrets):
+		"""Cached fallback secrets are reloaded when the file changes on disk."""
+		file_secrets.set_api_key('service1', 'key1')
+		assert file_secrets.get_api_key('service1') == 'key1'
+		
+		other = SecretsManager()
+		other.fallback_path = file_secrets.fallback_path
+		other.set_api_key('service1', 'key1-updated')
+		
+		assert file_secrets.get_api_key('service1') == 'key1-updated'
+
 
 # ============= SQLITE OPTIMIZER TESTS =============
 
 class TestSQLiteOptimizer:
 	"""Test SQLite performance optimizations."""
 
+	SCHEMA = '''
+		CREATE TABLE gpkg_tiles (
+			id INTEGER PRIMARY KEY,
+			zoom_level INTEGER,
+			tile_column INTEGER,
+			tile_row INTEGER,
+			tile_data BLOB,
+			last_modified DATETIME DEFAULT CURRENT_TIMESTAMP
+		)
+	'''
+
 	@pytest.fixture
-	def test_db(self):
-		"""Create test SQLite database."""
-		with tempfile.TemporaryDirectory() as tmpdir:
-			db_path = Path(tmpdir) / 'test.gpkg'
-			conn = sqlite3.connect(str(db_path))
-			
-			# Create tiles table (mimicking GPKG)
-			conn.execute('''
-				CREATE TABLE gpkg_tiles (
-					id INTEGER PRIMARY KEY,
-					zoom_level INTEGER,
-					tile_column INTEGER,
-					tile_row INTEGER,
-					tile_data BLOB,
-					last_modified DATETIME DEFAULT CURRENT_TIMESTAMP
-				)
-			''')
-			conn.commit()
-			
-			yield conn, db_path
-			conn.close()
-
-	def test_sqlite_optimizer_applies_pragmas(self, test_db):
-		"""Optimizer sets SQLite PRAGMAs for performance."""
-		conn, _ = test_db
-		
-		SQLiteOptimizer.apply_pragmas(conn)
-		
-		# Check WAL mode
-		cursor = conn.execute('PRAGMA journal_mode')
-		assert cursor.fetchone()[0].lower() == 'wal'
+	def test_db(self, tmp_path):
+		"""Create test SQLite database, on disk: the optimizer opens its own connections by path."""
+		db_path = tmp_path / 'test.gpkg'
+		conn = sqlite3.connect(str(db_path))
+		
+		# Create tiles table (mimicking GPKG)
+		conn.execute(self.SCHEMA)
+		conn.commit()
+		
+		yield conn, db_path
+		conn.close()
+
+	def test_sqlite_optimizer_applies_pragmas(self, tmp_path):
+		"""Optimizer sets SQLite PRAGMAs for performance, keeping the new database layout."""
+		db_path = str(tmp_path / 'new.gpkg')
+		assert SQLiteOptimizer.init_new_db(db_path) is True
+		conn = sqlite3.connect(db_path)
+		conn.execute(self.SCHEMA)
+		conn.commit()
+		conn.close()
+		
+		assert SQLiteOptimizer.apply_pragmas(db_path) is True
+		
+		# Persistent PRAGMAs are stored in the file, check them from a new connection
+		check = sqlite3.connect(db_path)
+		try:
+			assert check.execute('PRAGMA journal_mode').fetchone()[0].lower() == 'wal'
+			assert check.execute('PRAGMA page_size').fetchone()[0] == SQLiteOptimizer.PERSISTENT_PRAGMAS['page_size']
+		finally:
+			check.close()
 
 	def test_sqlite_optimizer_creates_indexes(self, test_db):
 		"""Optimizer creates composite indexes for common queries."""
-		conn, _ = test_db
+		conn, db_path = test_db
 		
-		SQLiteOptimizer.create_indexes(conn)
+		assert SQLiteOptimizer.create_indexes(str(db_path)) is True
 		
 		# Check that indexes exist
 		cursor = conn.execute(
@@ -525,11 +541,12 @@ class TestSQLiteOptimizer:
 		conn, db_path = test_db
 		
 		# Insert and delete data to create fragmentation
-		for i in range(100):
-			conn.execute(
-				'INSERT INTO gpkg_tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)',
-				(i % 5, i, i, b'data' * 100)
-			)
+		blob = b'data' * 100
+		conn.execute('BEGIN')
+		conn.executemany(
+			'INSERT INTO gpkg_tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)',
+			((i % 5, i, i, blob) for i in range(100))
+		)
 		conn.commit()
 		
 		size_before = db_path.stat().st_size
@@ -541,7 +558,7 @@ class TestSQLiteOptimizer:
 		size_fragmented = db_path.stat().st_size
 		
 		# Vacuum
-		SQLiteOptimizer.vacuum_database(conn)
+		assert SQLiteOptimizer.vacuum_database(str(db_path)) is True
 		
 		size_after = db_path.stat().st_size
 		
@@ -549,6 +566,103 @@ class TestSQLiteOptimizer:
 		assert size_after < size_fragmented
 
 
+# ============= PERFORMANCE MONITOR TESTS =============
+
+class TestPerformanceMonitor:
+	"""Test metric aggregation."""
+
+	def test_metric_summary_single_value(self):
+		"""Percentiles of a single value are that value."""
+		monitor = PerformanceMonitor()
+		monitor.record_metric('tile_download', 'latency', 0.5)
+		
+		summary = monitor.get_metric_summary('tile_download', 'latency')
+		
+		assert summary['count'] == 1
+		assert summary['median'] == summary['p95'] == summary['p99'] == 0.5
+
+	def test_metric_summary_percentiles(self):
+		"""Percentiles use the lower nearest-rank convention."""
+		monitor = PerformanceMonitor()
+		for i in range(1, 101):
+			monitor.record_metric('tile_download', 'latency', float(i))
+		
+		summary = monitor.get_metric_summary('tile_download', 'latency')
+		
+		assert summary['count'] == 100
+		assert summary['min'] == 1.0
+		assert summary['max'] == 100.0
+		assert summary['mean'] == 50.5
+		assert summary['median'] == 50.0
+		assert summary['p95'] == 95.0
+		assert summary['p99'] == 99.0
+
+	def test_metric_summary_respects_max_events(self):
+		"""Evicted events no longer count in summaries."""
+		monitor = PerformanceMonitor(max_events=10)
+		for i in range(25):
+			monitor.record_metric('tile_download', 'latency', float(i))
+		
+		summary = monitor.get_metric_summary('tile_download', 'latency')
+		
+		assert summary['count'] == 10
+		assert summary['min'] == 15.0
+
+	def test_eviction_keeps_series_in_sync(self):
+		"""Evicting interleaved series drops the oldest event of each series."""
+		monitor = PerformanceMonitor(max_events=40)
+		for i in range(100):
+			monitor.record_metric('tile_download', 'latency' if i % 3 else 'download_speed', float(i))
+		
+		latency = monitor.get_metric_summary('tile_download', 'latency')
+		speed = monitor.get_metric_summary('tile_download', 'download_speed')
+		
+		assert latency['count'] + speed['count'] == 40
+		assert min(latency['min'], speed['min']) == 60.0
+
+	def test_close_stops_threshold_worker(self):
+		"""close() stops the background threshold thread."""
+		monitor = PerformanceMonitor()
+		monitor.record_metric('tile_download', 'latency', 10.0)
+		worker = monitor._threshold_worker
+		assert worker.is_alive()
+		
+		monitor.close(timeout=5)
+		
+		assert not worker.is_alive()
+		
+		# Metrics are still recorded, but no longer queued for the stopped thread
+		for _ in range(1000):
+			monitor.record_metric('tile_download', 'latency', 10.0)
+		assert monitor._threshold_queue.qsize() <= 1
+		assert monitor.get_metric_summary('tile_download', 'latency')['count'] == 1001
+
+	def test_cache_statistics(self):
+		"""Cache hit rate is computed from hit/miss events."""
+		monitor = PerformanceMonitor()
+		for metric in ('cache_hit', 'cache_hit', 'cache_hit', 'cache_miss'):
+			monitor.record_metric('cache_lookup', metric, 1)
+		
+		stats = monitor.get_cache_statistics()
+		
+		assert stats == {'hit_count': 3, 'miss_count': 1, 'hit_rate': 0.75}
+
+	def test_export_import_roundtrip(self, tmp_path):
+		"""Exported metrics can be imported back."""
+		monitor = PerformanceMonitor()
+		for i in range(5):
+			monitor.record_metric('download', 'duration', i, {'tile': i})
+		
+		filepath = tmp_path / 'metrics.jsonl'
+		monitor.export_metrics(filepath)
+		
+		restored = PerformanceMonitor()
+		restored.import_metrics(filepath)
+		
+		assert restored.get_metric_summary('download', 'duration') == monitor.get_metric_summary('download', 'duration')
+		assert restored.events[0].metadata == {'tile': 0}
+
+
 # ============= FIXTURE AND CONFTEST =============
 
 @pytest.fixture(scope="session")
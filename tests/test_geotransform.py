@@ -1,6 +1,10 @@
 # -*- coding:utf-8 -*-
 import math
-from core.proj.geotransform import view3d_to_proj, proj_to_view3d, move_origin_prj
+import numpy as np
+from core.proj.geotransform import (
+	view3d_to_proj, proj_to_view3d, move_origin_prj,
+	view3d_to_proj_array, proj_to_view3d_array, move_origin_prj_batch
+)
 
 
 def test_view3d_to_proj_basic():
@@ -17,8 +21,54 @@ def test_proj_to_view3d_basic():
 	scale = 2.0
 	x, y = 1040.0, 1990.0
 	dx, dy = proj_to_view3d(crsx, crsy, scale, x, y)
-	assert dx == x * scale - crsx
-	assert dy == y * scale - crsy
+	assert dx == (x - crsx) / scale
+	assert dy == (y - crsy) / scale
+
+
+def test_proj_to_view3d_inverts_view3d_to_proj():
+	crsx, crsy = 1000.0, 2000.0
+	scale = 2.0
+	x, y = view3d_to_proj(crsx, crsy, scale, 10.0, -5.0)
+	assert proj_to_view3d(crsx, crsy, scale, x, y) == (10.0, -5.0)
+
+
+def test_view3d_to_proj_vectorized():
+	dx = np.arange(10000, dtype=np.float64)
+	dy = np.arange(10000, dtype=np.float64) * -0.5
+	x, y = view3d_to_proj(1000.0, 2000.0, 2.0, dx, dy)
+	np.testing.assert_array_equal(x, 1000.0 + dx * 2.0)
+	np.testing.assert_array_equal(y, 2000.0 + dy * 2.0)
+
+
+def test_view3d_proj_roundtrip_vectorized():
+	dx = np.arange(10000, dtype=np.float64)
+	dy = np.arange(10000, dtype=np.float64) * -0.5
+	x, y = view3d_to_proj(1000.0, 2000.0, 2.0, dx, dy)
+	rdx, rdy = proj_to_view3d(1000.0, 2000.0, 2.0, x, y)
+	np.testing.assert_array_equal(rdx, dx)
+	np.testing.assert_array_equal(rdy, dy)
+
+
+def test_view3d_to_proj_array_matches_scalar():
+	crsx, crsy = 1000.0, 2000.0
+	scale = 2.0
+	dx = np.array([10.0, -5.0, 0.0])
+	dy = np.array([-5.0, 3.0, 7.5])
+	x, y = view3d_to_proj_array(crsx, crsy, scale, dx, dy)
+	expected = [view3d_to_proj(crsx, crsy, scale, a, b) for a, b in zip(dx, dy)]
+	assert x.tolist() == [e[0] for e in expected]
+	assert y.tolist() == [e[1] for e in expected]
+
+
+def test_proj_to_view3d_array_matches_scalar():
+	crsx, crsy = 1000.0, 2000.0
+	scale = 2.0
+	x = [1040.0, 990.0]
+	y = [1990.0, 2010.0]
+	dx, dy = proj_to_view3d_array(crsx, crsy, scale, x, y)
+	expected = [proj_to_view3d(crsx, crsy, scale, a, b) for a, b in zip(x, y)]
+	assert dx.tolist() == [e[0] for e in expected]
+	assert dy.tolist() == [e[1] for e in expected]
 
 
 def test_move_origin_prj_use_scale():
@@ -30,6 +80,12 @@ def test_move_origin_prj_use_scale():
 	assert new_y == dy * scale
 
 
+def test_move_origin_prj_use_scale_from_origin():
+	new_x, new_y = move_origin_prj(1000.0, 2000.0, 100.0, 50.0, 2.0, use_scale=True)
+	assert new_x == 1000.0 + 100.0 * 2.0
+	assert new_y == 2000.0 + 50.0 * 2.0
+
+
 def test_move_origin_prj_no_scale():
 	crsx, crsy = 10.0, -10.0
 	scale = 3.0
@@ -37,3 +93,15 @@ def test_move_origin_prj_no_scale():
 	new_x, new_y = move_origin_prj(crsx, crsy, dx, dy, scale, use_scale=False)
 	assert new_x == crsx + dx
 	assert new_y == crsy + dy
+
+
+def test_move_origin_prj_batch_matches_scalar():
+	crsx = np.array([0.0, 10.0])
+	crsy = np.array([0.0, -10.0])
+	dx = np.array([2.0, 1.5])
+	dy = np.array([4.0, -3.0])
+	for use_scale in (True, False):
+		new_x, new_y = move_origin_prj_batch(crsx, crsy, dx, dy, 3.0, use_scale=use_scale)
+		expected = [move_origin_prj(*args, 3.0, use_scale=use_scale) for args in zip(crsx, crsy, dx, dy)]
+		assert new_x.tolist() == [e[0] for e in expected]
+		assert new_y.tolist() == [e[1] for e in expected]
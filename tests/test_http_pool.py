@@ -0,0 +1,132 @@
+# -*- coding:utf-8 -*-
+"""Tests for core.utils.http_pool, against a local http.server."""
+
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+import pytest
+
+from core.utils.http_pool import open_url, read_body, close_connections
+
+
+BODY = b'DEM' * 1000
+ETAG = '"dem-v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'  # Keep-alive
+
+	def do_GET(self):
+		# Through a proxy the request line holds the absolute URL
+		path = urlsplit(self.path).path
+		self.server.requests.append((path, self.client_address[1]))
+		if path == '/dem.tif':
+			if self.headers.get('If-None-Match') == ETAG:
+				self._reply(304)
+			else:
+				self._reply(200, BODY, {'ETag': ETAG})
+		elif path == '/redirect':
+			self._reply(302, headers={'Location': '/dem.tif'})
+		elif path == '/once':
+			# Close the connection after replying, without telling the client
+			self._reply(200, BODY)
+			self.close_connection = True
+		else:
+			self._reply(404, b'not found')
+
+	def _reply(self, status, body=b'', headers=None):
+		self.send_response(status)
+		for name, value in (headers or {}).items():
+			self.send_header(name, value)
+		if status != 304:
+			self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *args):
+		pass
+
+
+@pytest.fixture
+def server():
+	"""Local HTTP server, server.requests records (path, client port) of each request."""
+	httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+	httpd.requests = []
+	thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+	thread.start()
+	yield httpd
+	close_connections()
+	httpd.shutdown()
+	httpd.server_close()
+
+
+@pytest.fixture
+def proxy(server, monkeypatch):
+	"""Route http:// requests through the local server, as an HTTP proxy."""
+	monkeypatch.setenv('http_proxy', f'http://127.0.0.1:{server.server_port}')
+	monkeypatch.delenv('no_proxy', raising=False)
+	monkeypatch.delenv('NO_PROXY', raising=False)
+	# urlopen caches an opener built with the proxies of the first call
+	monkeypatch.setattr(urllib.request, '_opener', None)
+	return server
+
+
+def _url(server, path):
+	return f'http://127.0.0.1:{server.server_port}{path}'
+
+
+def test_open_url_reuses_connection(server):
+	for _ in range(3):
+		assert read_body(open_url(_url(server, '/dem.tif'), timeout=5)) == BODY
+	
+	ports = {port for _, port in server.requests}
+	assert len(server.requests) == 3
+	assert len(ports) == 1
+
+
+def test_open_url_follows_redirect(server):
+	response = open_url(_url(server, '/redirect'), timeout=5)
+	
+	assert response.status == 200
+	assert read_body(response) == BODY
+	assert [path for path, _ in server.requests] == ['/redirect', '/dem.tif']
+
+
+def test_open_url_retries_after_server_close(server):
+	assert read_body(open_url(_url(server, '/once'), timeout=5)) == BODY
+	
+	# The pooled connection was closed by the server, a fresh one is opened
+	assert read_body(open_url(_url(server, '/dem.tif'), timeout=5)) == BODY
+	assert server.requests[-1][0] == '/dem.tif'
+	assert server.requests[0][1] != server.requests[-1][1]
+
+
+def test_open_url_raises_http_error(server):
+	with pytest.raises(HTTPError) as excinfo:
+		open_url(_url(server, '/missing'), timeout=5)
+	assert excinfo.value.code == 404
+	
+	# The error body was drained, the connection is still usable
+	assert read_body(open_url(_url(server, '/dem.tif'), timeout=5)) == BODY
+	assert len({port for _, port in server.requests}) == 1
+
+
+def test_open_url_not_modified(server):
+	response = open_url(_url(server, '/dem.tif'), {'If-None-Match': ETAG}, timeout=5)
+	assert response.status == 304
+	assert read_body(response) == b''
+
+
+def test_open_url_not_modified_through_proxy(proxy):
+	response = open_url('http://dem.example/dem.tif', {'If-None-Match': ETAG}, timeout=5)
+	assert response.status == 304
+	response.close()
+
+
+def test_open_url_body_through_proxy(proxy):
+	response = open_url('http://dem.example/dem.tif', timeout=5)
+	assert response.status == 200
+	assert read_body(response) == BODY